@@ -6,7 +6,25 @@ for seamless Claude Code session continuity.
 
 from __future__ import annotations
 
-from claude_q.core import QueueStore, default_base_dir
+import typing as typ
+
+if typ.TYPE_CHECKING:
+    from claude_q.core import Message, QueueStore, default_base_dir
 
 __version__ = "0.1.0"
-__all__ = ["QueueStore", "__version__", "default_base_dir"]
+__all__ = ["Message", "QueueStore", "__version__", "default_base_dir"]
+
+
+def __getattr__(name: str) -> object:
+    """Load the queue API from ``claude_q.core`` on first access.
+
+    Hook scripts import submodules of this package on every prompt; keeping
+    ``claude_q.core`` out of the package import lets them skip it on paths
+    that never touch a queue.
+    """
+    if name in {"Message", "QueueStore", "default_base_dir"}:
+        from claude_q import core
+
+        return getattr(core, name)
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -0,0 +1,35 @@
+"""JSON encoding shared by queue storage, the hooks, and the CLI.
+
+Uses ``orjson`` when it is installed (the ``speedups`` extra) and the standard
+library ``json`` module otherwise. Both paths work on UTF-8 bytes and emit
+compact output, so callers can write the result straight to a binary stream.
+
+Examples
+--------
+Round-trip a value::
+
+    from claude_q._codec import dumps, loads
+
+    assert loads(dumps({"uuid": "abc"})) == {"uuid": "abc"}
+
+"""
+
+from __future__ import annotations
+
+import json
+import typing as typ
+
+try:
+    import orjson
+except ImportError:  # Optional: ``claude-q[speedups]``.
+    loads: typ.Callable[[bytes | str], typ.Any] = json.loads
+
+    def dumps(obj: typ.Any) -> bytes:  # noqa: ANN401 - any JSON value.
+        """Encode ``obj`` as compact UTF-8 JSON."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+else:
+    loads = orjson.loads
+    dumps = orjson.dumps
+
+__all__ = ["dumps", "loads"]
@@ -20,6 +20,7 @@ Enqueue a message with the editor::
 from __future__ import annotations
 
 import sys
+import typing as typ
 from pathlib import (
     Path,  # noqa: TC003  # TODO(leynos): https://github.com/leynos/claude-q/issues/123 - Path required at runtime for CLI annotations.
 )
@@ -32,12 +33,24 @@ from claude_q.cli.helpers import (
     dequeue_with_poll,
     edit_text,
     read_stdin_text,
+    split_batch,
     split_topic_and_body,
     summarize,
     validate_topic,
+    write_content,
 )
 from claude_q.core import QueueStore, default_base_dir
 
+if typ.TYPE_CHECKING:
+    import collections.abc as cabc
+
+    from claude_q.core import Message
+
+# Lines joined into each stdout write when listing a topic. A terminal stdout
+# is line-buffered and flushes on every write containing a newline, so one
+# joined write per batch means one syscall per batch rather than per line.
+_LIST_BATCH_SIZE = 64
+
 # Main CLI application
 app = cyclopts.App(
     name="q",
@@ -94,6 +107,8 @@ def put(
 def readto(
     topic: str | None = None,
     *,
+    batch: bool = False,
+    sep: typ.Annotated[str, cyclopts.Parameter(show_default=False)] = "\0",
     base_dir: Path | None = None,
 ) -> int:
     """Read stdin, enqueue message.
@@ -104,6 +119,11 @@ def readto(
     ----------
     topic : str | None, optional
         Queue topic name.
+    batch : bool, optional
+        Treat stdin as several messages split on --sep and enqueue them all
+        in one atomic write.
+    sep : str, optional
+        Message separator for --batch (default: NUL).
     base_dir : Path | None, optional
         Storage directory (overrides Q_DIR and XDG_STATE_HOME).
 
@@ -122,8 +142,9 @@ def readto(
     else:
         topic_str, body = split_topic_and_body(text)
 
-    uid = store.append(topic_str, body)
-    sys.stdout.write(uid + "\n")
+    bodies = split_batch(body, sep) if batch else [body]
+    uids = store.append_many(topic_str, bodies)
+    sys.stdout.writelines(uid + "\n" for uid in uids)
     return 0
 
 
@@ -142,9 +163,9 @@ def get(
     topic : str
         Queue topic name.
     block : bool, optional
-        Block (poll) until a message exists.
+        Wait until a message exists.
     poll : float, optional
-        Polling interval in seconds when --block is used.
+        Maximum seconds between queue checks when --block is used.
     base_dir : Path | None, optional
         Storage directory (overrides Q_DIR and XDG_STATE_HOME).
 
@@ -159,8 +180,7 @@ def get(
     msg = dequeue_with_poll(store, topic_str, block=block, poll=poll)
     if msg is None:
         return 1
-    sys.stdout.write(str(msg.get("content", "")))
-    sys.stdout.flush()
+    write_content(msg["content"])
     return 0
 
 
@@ -199,16 +219,29 @@ def peek(
     if message is None:
         return 1
 
-    sys.stdout.write(str(message.get("content", "")))
-    sys.stdout.flush()
+    write_content(message["content"])
     return 0
 
 
+def _write_json_lines(messages: cabc.Iterable[Message]) -> None:
+    """Write messages to stdout as newline-delimited JSON."""
+    # Deferred: only ``list --json`` needs an encoder.
+    from claude_q._codec import dumps
+
+    sys.stdout.flush()
+    # The binary layer is block-buffered even on a terminal, so no batching
+    # is needed to keep the write count down.
+    out = sys.stdout.buffer
+    out.writelines(dumps(m) + b"\n" for m in messages)
+    out.flush()
+
+
 @app.command(name="list")
 def list_cmd(
     topic: str,
     *,
     quiet: bool = False,
+    json: bool = False,
     base_dir: Path | None = None,
 ) -> int:
     """List messages with UUID and a summary.
@@ -219,6 +252,8 @@ def list_cmd(
         Queue topic name.
     quiet : bool, optional
         Only print UUIDs (no summaries).
+    json : bool, optional
+        Print each full message as one JSON object per line instead.
     base_dir : Path | None, optional
         Storage directory (overrides Q_DIR and XDG_STATE_HOME).
 
@@ -230,15 +265,22 @@ def list_cmd(
     """
     store = QueueStore(base_dir or default_base_dir())
     topic_str = validate_topic(topic)
+    if json:
+        _write_json_lines(store.iter_messages(topic_str))
+        return 0
 
-    msgs = store.list_messages(topic_str)
-    for m in msgs:
-        uid = str(m.get("uuid", ""))
+    batch: list[str] = []
+    for m in store.iter_messages(topic_str):
+        uid = m["uuid"]
         if quiet:
-            sys.stdout.write(uid + "\n")
+            batch.append(uid + "\n")
         else:
-            summary = summarize(str(m.get("content", "")))
-            sys.stdout.write(f"{uid} {summary}\n")
+            summary = summarize(m["content"])
+            batch.append(f"{uid} {summary}\n")
+        if len(batch) >= _LIST_BATCH_SIZE:
+            sys.stdout.write("".join(batch))
+            batch.clear()
+    sys.stdout.write("".join(batch))
     return 0
 
 
@@ -310,7 +352,7 @@ def edit(
     message = store.get_by_uuid(topic_str, uuid)
     if message is None:
         return 1
-    original = str(message.get("content", ""))
+    original = message["content"]
 
     edited = edit_text(original)
 
@@ -19,6 +19,7 @@ Dequeue a message (blocking until available)::
 from __future__ import annotations
 
 import sys
+import typing as typ
 from pathlib import (
     Path,  # noqa: TC003  # TODO(leynos): https://github.com/leynos/claude-q/issues/123 - Path required at runtime for CLI annotations.
 )
@@ -31,9 +32,10 @@ from claude_q.cli.helpers import (
     dequeue_with_poll,
     edit_text,
     read_stdin_text,
+    split_batch,
+    write_content,
 )
 from claude_q.core import QueueStore, default_base_dir
-from claude_q.git_integration import GitError, derive_topic
 
 # Git-aware CLI application
 git_app = cyclopts.App(
@@ -44,6 +46,19 @@ git_app = cyclopts.App(
 )
 
 
+def _current_topic() -> str | None:
+    """Derive the topic for the working directory, reporting any failure."""
+    # Deferred: ``q`` imports this module through ``claude_q.cli`` and should
+    # not pay for git support it never uses.
+    from claude_q.git_integration import GitError, derive_topic
+
+    try:
+        return derive_topic()
+    except GitError as e:
+        sys.stderr.write(f"git q: {e}\n")
+        return None
+
+
 @git_app.default
 def git_main_help() -> None:
     """Show the help message when no command is specified."""
@@ -65,10 +80,8 @@ def git_put(*, base_dir: Path | None = None) -> int:
         Exit code (0 on success).
 
     """
-    try:
-        topic = derive_topic()
-    except GitError as e:
-        sys.stderr.write(f"git q: {e}\n")
+    topic = _current_topic()
+    if topic is None:
         return 1
 
     store = QueueStore(base_dir or default_base_dir())
@@ -79,11 +92,21 @@ def git_put(*, base_dir: Path | None = None) -> int:
 
 
 @git_app.command
-def git_readto(*, base_dir: Path | None = None) -> int:
+def git_readto(
+    *,
+    batch: bool = False,
+    sep: typ.Annotated[str, cyclopts.Parameter(show_default=False)] = "\0",
+    base_dir: Path | None = None,
+) -> int:
     """Read stdin, enqueue into git-derived topic.
 
     Parameters
     ----------
+    batch : bool, optional
+        Treat stdin as several messages split on --sep and enqueue them all
+        in one atomic write.
+    sep : str, optional
+        Message separator for --batch (default: NUL).
     base_dir : Path | None, optional
         Storage directory (overrides Q_DIR and XDG_STATE_HOME).
 
@@ -93,16 +116,15 @@ def git_readto(*, base_dir: Path | None = None) -> int:
         Exit code (0 on success).
 
     """
-    try:
-        topic = derive_topic()
-    except GitError as e:
-        sys.stderr.write(f"git q: {e}\n")
+    topic = _current_topic()
+    if topic is None:
         return 1
 
     store = QueueStore(base_dir or default_base_dir())
     body = read_stdin_text()
-    uid = store.append(topic, body)
-    sys.stdout.write(uid + "\n")
+    bodies = split_batch(body, sep) if batch else [body]
+    uids = store.append_many(topic, bodies)
+    sys.stdout.writelines(uid + "\n" for uid in uids)
     return 0
 
 
@@ -118,9 +140,9 @@ def git_get(
     Parameters
     ----------
     block : bool, optional
-        Block (poll) until a message exists.
+        Wait until a message exists.
     poll : float, optional
-        Polling interval in seconds when --block is used.
+        Maximum seconds between queue checks when --block is used.
     base_dir : Path | None, optional
         Storage directory (overrides Q_DIR and XDG_STATE_HOME).
 
@@ -130,18 +152,15 @@ def git_get(
         Exit code (0 if message found, 1 if queue empty).
 
     """
-    try:
-        topic = derive_topic()
-    except GitError as e:
-        sys.stderr.write(f"git q: {e}\n")
+    topic = _current_topic()
+    if topic is None:
         return 1
 
     store = QueueStore(base_dir or default_base_dir())
     msg = dequeue_with_poll(store, topic, block=block, poll=poll)
     if msg is None:
         return 1
-    sys.stdout.write(str(msg.get("content", "")))
-    sys.stdout.flush()
+    write_content(msg["content"])
     return 0
 
 
@@ -154,6 +173,8 @@ def git_q_main() -> int:
         Exit code.
 
     """
+    from claude_q.git_integration import GitError
+
     try:
         result = git_app()
         match result:
@@ -15,21 +15,28 @@ Split editor text into topic and body::
 
 from __future__ import annotations
 
+import functools
 import os
 import re
 import shlex
 import sys
 import tempfile
-import time
 import typing as typ
 from pathlib import Path
 
-from cuprum import Program
-
-from claude_q.command_runner import RunOptions, run_sync
+from claude_q.notify import watch_file
 
 if typ.TYPE_CHECKING:
-    from claude_q.core import QueueStore
+    from claude_q.core import Message, QueueStore
+
+# Large buffers keep big drafts to a handful of read/write syscalls.
+_EDIT_BUFFER_SIZE = 64 * 1024
+
+# Whitespace runs collapsed to a single space in one-line summaries.
+_WS_RE = re.compile(r"\s+")
+
+# The line boundaries recognised by ``str.splitlines``, with CRLF as one.
+_LINE_BREAK_RE = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
 
 
 class EditorError(Exception):
@@ -74,11 +81,17 @@ def editor_cmd() -> list[str]:
 
     """
     editor = os.environ.get("VISUAL") or os.environ.get("EDITOR") or "vi"
+    return list(_parse_editor(editor))
+
+
+@functools.cache
+def _parse_editor(editor: str) -> tuple[str, ...]:
+    """Split an editor setting into command parts, memoised per value."""
     try:
         tokens = shlex.split(editor)
     except ValueError:
-        return ["vi"]
-    return tokens or ["vi"]
+        return ("vi",)
+    return tuple(tokens) or ("vi",)
 
 
 def edit_text(initial: str = "") -> str:
@@ -100,21 +113,24 @@ def edit_text(initial: str = "") -> str:
         If the editor exits with a non-zero status.
 
     """
-    with tempfile.NamedTemporaryFile(
-        "w+", encoding="utf-8", delete=False, prefix="q.", suffix=".txt"
-    ) as tf:
-        path = Path(tf.name)
-        tf.write(initial)
-        tf.flush()
+    # Deferred: only editor-driven commands spawn a process.
+    import subprocess  # noqa: S404  # Editors need the caller's terminal; see below.
 
+    fd, name = tempfile.mkstemp(prefix="q.", suffix=".txt")
+    path = Path(name)
     try:
+        with os.fdopen(fd, "w", encoding="utf-8", buffering=_EDIT_BUFFER_SIZE) as tf:
+            tf.write(initial)
+
         cmd = [*editor_cmd(), str(path)]
-        program = Program(cmd[0])
-        options = RunOptions(capture=False, echo=True)
-        result = run_sync(program, cmd[1:], options=options)
-        if not result.ok:
-            raise EditorError(exit_code=result.exit_code, cmd=cmd)
-        return path.read_text(encoding="utf-8")
+        # The editor must inherit stdin/stdout/stderr so it sees a terminal.
+        # cuprum always pipes (or discards) output, so it cannot host an
+        # interactive program; run it directly instead.
+        result = subprocess.run(cmd, check=False)  # noqa: S603  # User-chosen $VISUAL/$EDITOR.
+        if result.returncode != 0:
+            raise EditorError(exit_code=result.returncode, cmd=cmd)
+        with path.open(encoding="utf-8", buffering=_EDIT_BUFFER_SIZE) as edited:
+            return edited.read()
     finally:
         path.unlink(missing_ok=True)
 
@@ -138,10 +154,7 @@ def split_topic_and_body(text: str) -> tuple[str, str]:
         If the topic is empty.
 
     """
-    if "\n" in text:
-        first, rest = text.split("\n", 1)
-    else:
-        first, rest = text, ""
+    first, _, rest = text.partition("\n")
     topic = first.strip()
     if not topic:
         msg = "topic is empty"
@@ -149,6 +162,39 @@ def split_topic_and_body(text: str) -> tuple[str, str]:
     return topic, rest
 
 
+def split_batch(text: str, sep: str) -> list[str]:
+    """Split batched input into individual message bodies.
+
+    A trailing separator (as written by ``find -print0`` and friends) does not
+    produce an empty final message.
+
+    Parameters
+    ----------
+    text : str
+        Input holding one or more messages.
+    sep : str
+        Separator between messages.
+
+    Returns
+    -------
+    list[str]
+        Message bodies in input order; empty when ``text`` is empty.
+
+    Raises
+    ------
+    ValueError
+        If the separator is empty.
+
+    """
+    if not sep:
+        msg = "batch separator is empty"
+        raise ValueError(msg)
+    bodies = text.split(sep)
+    if not bodies[-1]:
+        bodies.pop()
+    return bodies
+
+
 def validate_topic(topic: str) -> str:
     """Validate and normalise a topic string.
 
@@ -178,13 +224,41 @@ def validate_topic(topic: str) -> str:
 def read_stdin_text() -> str:
     """Read all text from stdin without modification.
 
+    Stdin is read as raw bytes and decoded as UTF-8 in one pass, bypassing
+    the text layer's chunked decoding and newline translation, so CRLF line
+    endings are preserved.
+
     Returns
     -------
     str
         Stdin content.
 
+    Raises
+    ------
+    UnicodeDecodeError
+        If stdin is not valid UTF-8.
+
     """
-    return sys.stdin.read()
+    return sys.stdin.buffer.read().decode("utf-8")
+
+
+def write_content(content: str) -> None:
+    """Write message content to stdout exactly as stored.
+
+    The content is encoded as UTF-8 in one pass and written to the binary
+    layer, mirroring ``read_stdin_text``: no newline translation and no
+    per-chunk encoding in the text layer.
+
+    Parameters
+    ----------
+    content : str
+        Message content to emit.
+
+    """
+    sys.stdout.flush()  # Keep ordering with anything already written as text.
+    out = sys.stdout.buffer
+    out.write(content.encode("utf-8", errors="surrogateescape"))
+    out.flush()
 
 
 def dequeue_with_poll(
@@ -193,8 +267,12 @@ def dequeue_with_poll(
     *,
     block: bool,
     poll: float,
-) -> dict[str, typ.Any] | None:
-    """Dequeue a message, optionally polling until one exists.
+) -> Message | None:
+    """Dequeue a message, optionally waiting until one exists.
+
+    When blocking, the topic file is watched (inotify/kqueue where available)
+    so the wait ends as soon as a producer writes; ``poll`` caps each wait in
+    case a notification is missed.
 
     Parameters
     ----------
@@ -203,23 +281,27 @@ def dequeue_with_poll(
     topic : str
         Queue topic name.
     block : bool
-        Whether to poll until a message exists.
+        Whether to wait until a message exists.
     poll : float
-        Poll interval in seconds when blocking.
+        Maximum seconds to wait between queue checks when blocking.
 
     Returns
     -------
-    dict[str, typing.Any] | None
+    Message | None
         Dequeued message, or None when no message is available.
 
     """
-    while True:
-        msg = store.pop_first(topic)
-        if msg is not None:
-            return msg
-        if not block:
-            return None
-        time.sleep(poll)
+    msg = store.pop_first(topic)
+    if msg is not None or not block:
+        return msg
+
+    store.ensure_base_dir()
+    with watch_file(store.paths_for_topic(topic).data) as watcher:
+        # Re-check after the watch is registered so a write that landed
+        # in between is not slept through.
+        while (msg := store.pop_first(topic)) is None:
+            watcher.wait(poll)
+    return msg
 
 
 def summarize(content: str, width: int = 80) -> str:
@@ -238,13 +320,17 @@ def summarize(content: str, width: int = 80) -> str:
         Summarised content, possibly truncated with ellipsis.
 
     """
-    lines = content.splitlines()
-    first = lines[0] if lines else ""
-    first = re.sub(r"\s+", " ", first.strip())
+    # Only the first line is shown, so avoid splitting the whole message.
+    match = _LINE_BREAK_RE.search(content)
+    if match is None:
+        first, rest = content, ""
+    else:
+        first, rest = content[: match.start()], content[match.end() :]
+    first = _WS_RE.sub(" ", first.strip())
     if not first:
         first = "(empty)"
 
-    more = len(lines) > 1
+    more = bool(rest)
     return _format_summary_line(first, more=more, width=width)
 
 
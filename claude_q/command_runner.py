@@ -43,6 +43,9 @@ if typ.TYPE_CHECKING:
 CUPRUM_DOCS = ("docs/cuprum-users-guide.md",)
 PROJECT_NAME = "claude-q"
 GIT = Program("git")
+# Frozen and resolved per run, so every call without cwd/env/tags (all of
+# the git lookups) can share one instance.
+_DEFAULT_CONTEXT = ExecutionContext()
 
 
 @dc.dataclass(frozen=True)
@@ -160,5 +163,7 @@ def run_sync(
             context_kwargs["env"] = opts.env
         if opts.tags is not None:
             context_kwargs["tags"] = opts.tags
-        context = ExecutionContext(**context_kwargs)
+        context = (
+            ExecutionContext(**context_kwargs) if context_kwargs else _DEFAULT_CONTEXT
+        )
     return cmd.run_sync(context=context, echo=opts.echo, capture=opts.capture)
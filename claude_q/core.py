@@ -1,9 +1,18 @@
 """Core queue storage implementation for claude-q.
 
 Provides file-based FIFO queue storage with fcntl locking for safe concurrent
-access. Each topic is stored as a separate JSON file with an associated lock
+access. Each topic is stored as an append-only journal with an associated lock
 file for coordination. ``QueueStore`` exposes enqueue, dequeue, and peek
-operations via ``append()``, ``pop_first()``, and ``peek_first()``.
+operations via ``append()`` (or ``append_many()`` for batches),
+``pop_first()``, and ``peek_first()``.
+
+The journal (``<topic>.jsonl``) holds a version header followed by one JSON
+record per committed change: an ``append`` of one or more messages, a ``del``
+tombstone, or a ``replace`` of a message's content. Every mutation therefore
+writes a single short line instead of rewriting the queue, and the journal is
+compacted (rewritten with only the live messages) once most of its records are
+dead. Queue files from the earlier single-document format (``<topic>.json``)
+are still read, and are migrated to a journal on the first write.
 
 Examples
 --------
@@ -22,27 +31,46 @@ from __future__ import annotations
 
 import contextlib
 import dataclasses
-import datetime as dt
 import fcntl
+import functools
 import hashlib
 import json
 import os
 import tempfile
+import time
 import typing as typ
 import urllib.parse
 import uuid
 from pathlib import Path
 
+from claude_q._codec import dumps, loads
+
 if typ.TYPE_CHECKING:
     import collections.abc as cabc
 
 _ALLOWED_TOPIC_CHARS = (
     "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._-"
 )
+_ALLOWED_TOPIC_SET = frozenset(_ALLOWED_TOPIC_CHARS)
 _MAX_FILENAME_LENGTH = 180
 # Keep under filesystem limits, leave room for suffixes.
 
+_JOURNAL_VERSION = 2
+# Compact once dead records outnumber live messages, but not for tiny
+# journals where a rewrite would cost more than replaying a few records.
+_COMPACT_MIN_RECORDS = 64
+_TAIL_SCAN_CHUNK = 64 * 1024
+# Journal writes only need their data and the file size on disk, not the
+# timestamps fsync would also flush. macOS has no fdatasync.
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _is_safe_name(t: str) -> bool:
+    """Return True if ``t`` needs no quoting and has no leading/trailing dot."""
+    return _ALLOWED_TOPIC_SET.issuperset(t) and "." not in {t[0], t[-1]}
+
 
+@functools.lru_cache(maxsize=1024)
 def _topic_to_filename(topic: str) -> str:
     """Convert a topic string into a safe filename component."""
     t = topic.strip()
@@ -50,6 +78,10 @@ def _topic_to_filename(topic: str) -> str:
         msg = "topic is empty"
         raise ValueError(msg)
 
+    # Fast path: quoting and stripping would leave an already-safe name as is.
+    if len(t) <= _MAX_FILENAME_LENGTH and _is_safe_name(t):
+        return t
+
     safe = urllib.parse.quote(t, safe=_ALLOWED_TOPIC_CHARS)
     safe = safe.strip(".")  # avoid '.' or '..' shenanigans
     if not safe:
@@ -64,15 +96,216 @@ def _topic_to_filename(topic: str) -> str:
 
 def _utc_now_iso() -> str:
     """Return current UTC time as an ISO 8601 string."""
-    return dt.datetime.now(tz=dt.UTC).isoformat(timespec="seconds")
+    # Same text as ``datetime.now(UTC).isoformat(timespec="seconds")`` without
+    # building a datetime; this runs on every append and replace.
+    return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime())
+
+
+def _journal_header(topic: str) -> dict[str, typ.Any]:
+    """Return the header record that starts a new journal file.
+
+    The random ``id`` makes every journal file's header unique, so a reader
+    can tell a compacted replacement apart from the file it replayed even
+    when the filesystem reuses the old inode number.
+    """
+    return {"version": _JOURNAL_VERSION, "topic": topic, "id": uuid.uuid4().hex}
+
+
+def _encode_record(record: dict[str, typ.Any]) -> bytes:
+    """Serialise one journal record as a newline-terminated JSON line."""
+    return dumps(record) + b"\n"
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write ``data`` to ``fd``, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _sync_dir(path: Path) -> None:
+    """Flush directory ``path`` so entries created or renamed in it persist."""
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _trim_torn_tail(fd: int, size: int) -> int:
+    """Truncate a partially written final record; return the new size.
+
+    A crash mid-append can leave a last line without its newline. Readers
+    ignore it, but it must be cut off before the next record is appended or
+    the two would run together.
+    """
+    end = size
+    while end > 0:
+        start = max(0, end - _TAIL_SCAN_CHUNK)
+        newline = os.pread(fd, end - start, start).rfind(b"\n")
+        if newline >= 0:
+            end = start + newline + 1
+            break
+        end = start
+    os.ftruncate(fd, end)
+    return end
+
+
+def _valid_messages(msgs: list[typ.Any]) -> dict[str, Message]:
+    """Map uuid to message for the well-formed entries of ``msgs``."""
+    # Validate once here so callers can rely on the ``Message`` field types.
+    # This runs for every message replayed, so it is a single comprehension
+    # with plain isinstance checks rather than a loop over ``match`` patterns.
+    return {
+        uid: typ.cast("Message", m)
+        for m in msgs
+        if isinstance(m, dict)
+        and isinstance(uid := m.get("uuid"), str)
+        and isinstance(m.get("content"), str)
+    }
+
+
+def _apply_record(journal: _Journal, record: object) -> bool:
+    """Apply a decoded journal record; return False if it is unrecognised."""
+    messages = journal.messages
+    match record:
+        case {"op": "append", "messages": list() as appended}:
+            messages.update(_valid_messages(appended))
+        case {"op": "del", "uuid": uid}:
+            messages.pop(uid, None)
+        case {
+            "op": "replace",
+            "uuid": uid,
+            "content": str() as content,
+            "updated": str() as updated,
+        }:
+            if (m := messages.get(uid)) is not None:
+                m["content"] = content
+                m["updated"] = updated
+        case {"version": version} if version == _JOURNAL_VERSION:
+            return True  # Header line; not a change record.
+        case _:
+            return False
+    journal.records += 1
+    return True
+
+
+class Message(typ.TypedDict):
+    """A queued message as stored and returned by ``QueueStore``.
+
+    Attributes
+    ----------
+    uuid : str
+        Unique message identifier.
+    created : str
+        ISO 8601 UTC timestamp of when the message was enqueued.
+    content : str
+        Message body.
+    updated : str
+        ISO 8601 UTC timestamp of the last replacement, if any.
+
+    """
+
+    uuid: str
+    created: str
+    content: str
+    updated: typ.NotRequired[str]
 
 
 @dataclasses.dataclass(frozen=True)
 class TopicPaths:
-    """File paths for a topic's data and lock files."""
+    """File paths for a topic's journal, lock, and legacy data files."""
 
     data: Path
     lock: Path
+    legacy: Path
+
+
+@dataclasses.dataclass
+class _Journal:
+    """Replayed state of a topic journal.
+
+    Attributes
+    ----------
+    messages : dict[str, Message]
+        Live messages keyed by UUID, in FIFO order.
+    records : int
+        Number of records in the journal (header excluded).
+    legacy : bool
+        True when the state was read from a legacy single-document file.
+
+    """
+
+    messages: dict[str, Message]
+    records: int = 0
+    legacy: bool = False
+
+    def needs_compaction(self) -> bool:
+        """Return True when most journal records no longer describe messages."""
+        if self.legacy:
+            return True
+        live = len(self.messages)
+        return self.records >= _COMPACT_MIN_RECORDS and self.records > 2 * live
+
+    def copy(self) -> _Journal:
+        """Return a copy whose messages can be changed independently."""
+        return _Journal(
+            messages={uid: m.copy() for uid, m in self.messages.items()},
+            records=self.records,
+            legacy=self.legacy,
+        )
+
+
+@dataclasses.dataclass
+class _ReplayPoint:
+    """How far a topic journal has been replayed, and the state at that point.
+
+    Journal bytes before ``offset`` never change while the file keeps its
+    identity: appends only add to the end, torn-tail trimming only removes
+    bytes after the last newline, and compaction renames a new file into
+    place. Replay can therefore resume from ``offset`` on the same file.
+
+    The inode alone does not establish identity, because filesystems such as
+    ext4 hand a freed inode number to the next new file, and compaction frees
+    and allocates one each time. Each journal's header line carries a random
+    ``id``, so the header bytes are compared as well.
+
+    Attributes
+    ----------
+    file_id : tuple[int, int]
+        ``(st_dev, st_ino)`` of the replayed journal.
+    header : bytes
+        The journal's first line, newline included; empty until one is read.
+    offset : int
+        Bytes replayed so far; always just past a newline.
+    journal : _Journal
+        State after replaying ``offset`` bytes. Never handed out directly.
+
+    """
+
+    file_id: tuple[int, int]
+    header: bytes
+    offset: int
+    journal: _Journal
+
+    def resumes(self, fd: int, file_id: tuple[int, int], size: int) -> bool:
+        """Return True if replay can continue on the journal open as ``fd``."""
+        if self.file_id != file_id or self.offset > size:
+            return False
+        return os.pread(fd, len(self.header), 0) == self.header
+
+
+# Every operation resolves its topic's paths several times (lock, read,
+# write); topics are few per process, so the results are worth keeping.
+@functools.lru_cache(maxsize=1024)
+def _paths_for(base_dir: Path, topic: str) -> TopicPaths:
+    """Build the file paths for ``topic`` under ``base_dir``."""
+    safe = _topic_to_filename(topic)
+    return TopicPaths(
+        data=(base_dir / f"{safe}.jsonl"),
+        lock=(base_dir / f"{safe}.lock"),
+        legacy=(base_dir / f"{safe}.json"),
+    )
 
 
 class QueueStore:
@@ -80,26 +313,41 @@ class QueueStore:
 
     Notes
     -----
-    Each topic is stored as a separate JSON file with messages in FIFO order.
-    A dedicated lock file provides coordination for safe concurrent access.
+    Each topic is stored as a separate append-only journal whose replay gives
+    the messages in FIFO order. A dedicated lock file provides coordination
+    for safe concurrent access.
 
     Parameters
     ----------
     base_dir : Path
         Directory where queue files are stored.
+    durable : bool | None, optional
+        Sync every append to disk before returning. Defaults to the
+        ``Q_FSYNC`` environment variable (``0`` disables), else True.
 
     """
 
-    def __init__(self, base_dir: Path) -> None:
+    def __init__(self, base_dir: Path, *, durable: bool | None = None) -> None:
         """Initialise a queue store with a base directory.
 
         Parameters
         ----------
         base_dir : Path
             Directory where queue files are stored.
+        durable : bool | None, optional
+            Whether appends are synced to disk before they return. When None,
+            ``Q_FSYNC=0`` in the environment turns syncing off; otherwise it
+            stays on. Without syncing a power loss can lose or tear recent
+            appends. Compaction always syncs its new journal before swapping
+            it in, so it never replaces the queue with an unwritten file.
 
         """
         self.base_dir = base_dir
+        if durable is None:
+            durable = os.environ.get("Q_FSYNC", "1") != "0"
+        self.durable = durable
+        self._base_dir_ready = False
+        self._replayed: dict[str, _ReplayPoint] = {}
 
     def ensure_base_dir(self) -> None:
         """Create the base directory if it does not exist.
@@ -110,7 +358,9 @@ class QueueStore:
 
         Notes
         -----
-        Uses restricted permissions when possible.
+        Uses restricted permissions when possible. The directory is set up
+        once per store; if it is removed later, the next lock open fails
+        rather than silently recreating it.
 
         Returns
         -------
@@ -118,13 +368,17 @@ class QueueStore:
             None.
 
         """
+        # Once per store: a blocking ``get`` locks the topic on every check.
+        if self._base_dir_ready:
+            return
         self.base_dir.mkdir(parents=True, exist_ok=True)
         # Best-effort permissions tightening; don't explode on weird FS.
         with contextlib.suppress(OSError):
             self.base_dir.chmod(0o700)
+        self._base_dir_ready = True
 
     def paths_for_topic(self, topic: str) -> TopicPaths:
-        """Get file paths for a topic's data and lock files.
+        """Get file paths for a topic's journal, lock, and legacy files.
 
         Parameters
         ----------
@@ -134,14 +388,10 @@ class QueueStore:
         Returns
         -------
         TopicPaths
-            Paths for the topic's data and lock files.
+            Paths for the topic's journal, lock, and legacy data files.
 
         """
-        safe = _topic_to_filename(topic)
-        return TopicPaths(
-            data=(self.base_dir / f"{safe}.json"),
-            lock=(self.base_dir / f"{safe}.lock"),
-        )
+        return _paths_for(self.base_dir, topic)
 
     @contextlib.contextmanager
     def lock_topic(self, topic: str, *, exclusive: bool) -> cabc.Iterator[None]:
@@ -163,38 +413,121 @@ class QueueStore:
             Context manager scope for the lock.
 
         """
+        # Writers only run under this lock, so this is the one place the
+        # base directory needs creating.
         self.ensure_base_dir()
         paths = self.paths_for_topic(topic)
-        # 'a+' so it exists; do not truncate.
-        with paths.lock.open("a+", encoding="utf-8") as lf:
+        # A bare descriptor is all flock needs; create the file if missing,
+        # never truncate it.
+        fd = os.open(paths.lock, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o600)
+        try:
+            # A blocking flock sleeps in the kernel until the holder releases,
+            # and Ctrl-C still interrupts it (EINTR surfaces as
+            # KeyboardInterrupt), so there is nothing to gain from polling.
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
             try:
-                lf.flush()
-                lock_type = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
-                fcntl.flock(lf.fileno(), lock_type)
                 yield
             finally:
                 # If something truly odd happens, we still want to close.
                 with contextlib.suppress(OSError):
-                    fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
 
-    # TODO(leynos): https://github.com/leynos/claude-q/issues/123
-    def _load_messages_unlocked(  # noqa: C901
-        self, topic: str
-    ) -> list[dict[str, typ.Any]]:
+    def _load_messages_unlocked(self, topic: str) -> list[Message]:
         """Load messages from topic file without acquiring a lock."""
+        return list(self._replay_unlocked(topic).messages.values())
+
+    def _replay_unlocked(self, topic: str) -> _Journal:
+        """Replay the topic journal without acquiring a lock.
+
+        Replay resumes from where this store last stopped on the same journal
+        file, so repeated reads (a blocking ``get``, or a long-lived embedding
+        process) only decode records written since.
+        """
         paths = self.paths_for_topic(topic)
-        if not paths.data.exists():
-            return []
+        # Taken out while replaying, so a corrupt record cannot leave a
+        # half-applied state behind.
+        point = self._replayed.pop(topic, None)
         try:
-            raw = paths.data.read_text(encoding="utf-8")
+            f = paths.data.open("rb")
         except FileNotFoundError:
-            return []
+            legacy = self._load_legacy_unlocked(topic, paths.legacy)
+            if legacy is None:
+                return _Journal(messages={})
+            return _Journal(messages=legacy, legacy=True)
+
+        with f:
+            fd = f.fileno()
+            st = os.fstat(fd)
+            file_id = (st.st_dev, st.st_ino)
+            if point is None or not point.resumes(fd, file_id, st.st_size):
+                point = _ReplayPoint(file_id, b"", 0, _Journal(messages={}))
+            f.seek(point.offset)
+            raw = f.read()
+        if not point.header:
+            point.header = raw[: raw.find(b"\n") + 1]
+
+        # The final element is empty when the data ends in a newline, or a
+        # record still being written (or torn) otherwise; skip it either way
+        # and stop the replay point before it.
+        for line in raw.split(b"\n")[:-1]:
+            if line.strip():
+                self._apply_line(point.journal, topic, paths.data, line)
+        point.offset += raw.rfind(b"\n") + 1
+        self._replayed[topic] = point
+        return point.journal.copy()
+
+    def _replay_matching_unlocked(self, topic: str, uid: str) -> _Journal:
+        """Replay only the journal records that mention ``uid``.
+
+        A UUID lookup needs the record that appended the message plus any
+        later ``del``/``replace`` records for it. Finding those with
+        ``bytes.find`` avoids decoding every other record in the journal.
+        """
+        paths = self.paths_for_topic(topic)
+        try:
+            raw = paths.data.read_bytes()
+        except FileNotFoundError:
+            return self._replay_unlocked(topic)
+
+        journal = _Journal(messages={})
+        needle = uid.encode()
+        pos = raw.find(needle)
+        while pos >= 0:
+            start = raw.rfind(b"\n", 0, pos) + 1
+            end = raw.find(b"\n", pos)
+            if end < 0:
+                break  # Torn final record; ignored as in a full replay.
+            self._apply_line(journal, topic, paths.data, raw[start:end])
+            pos = raw.find(needle, end + 1)
+        return journal
+
+    @staticmethod
+    def _apply_line(journal: _Journal, topic: str, path: Path, line: bytes) -> None:
+        """Apply one journal line to the replayed state."""
+        try:
+            record = loads(line)
+        except json.JSONDecodeError as e:
+            msg = f"corrupt queue file for topic {topic!r}: {path}"
+            raise RuntimeError(msg) from e
+        if not _apply_record(journal, record):
+            msg = f"corrupt queue file for topic {topic!r}: {path}"
+            raise RuntimeError(msg)
+
+    @staticmethod
+    def _load_legacy_unlocked(topic: str, path: Path) -> dict[str, Message] | None:
+        """Load messages from a version 1 queue file; None if there is none."""
+        try:
+            raw = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
         if not raw.strip():
-            return []
+            return {}
         try:
-            data = json.loads(raw)
+            data = loads(raw)
         except json.JSONDecodeError as e:
-            msg = f"corrupt queue file for topic {topic!r}: {paths.data}"
+            msg = f"corrupt queue file for topic {topic!r}: {path}"
             raise RuntimeError(msg) from e
 
         match data:
@@ -202,7 +535,7 @@ class QueueStore:
                 msgs = messages
             case {"messages": _}:
                 msg = (
-                    f"corrupt queue file for topic {topic!r}: {paths.data} "
+                    f"corrupt queue file for topic {topic!r}: {path} "
                     "(messages not a list)"
                 )
                 # TODO(leynos): https://github.com/leynos/claude-q/issues/123 - FIXME:
@@ -212,30 +545,23 @@ class QueueStore:
                 # Back-compat: allow bare list.
                 msgs = messages
             case _:
-                msg = f"corrupt queue file for topic {topic!r}: {paths.data}"
+                msg = f"corrupt queue file for topic {topic!r}: {path}"
                 raise RuntimeError(msg)
 
-        # Validate minimally.
-        out: list[dict[str, typ.Any]] = []
-        for m in msgs:
-            match m:
-                case {"uuid": _, "content": _}:
-                    out.append(m)
-                case _:
-                    continue
-        return out
-
-    def _save_messages_unlocked(
-        self, topic: str, messages: list[dict[str, typ.Any]]
-    ) -> None:
-        """Save messages to topic file without acquiring a lock."""
+        return _valid_messages(msgs)
+
+    def _save_messages_unlocked(self, topic: str, messages: list[Message]) -> None:
+        """Rewrite the topic journal with only ``messages``, without locking.
+
+        This is the compaction path: the new journal is written to a temporary
+        file and atomically swapped in, after which any legacy queue file for
+        the topic is removed.
+        """
         paths = self.paths_for_topic(topic)
-        self.ensure_base_dir()
-        payload: dict[str, typ.Any] = {
-            "version": 1,
-            "topic": topic,
-            "messages": messages,
-        }
+        header = _encode_record(_journal_header(topic))
+        payload = header + b"".join(
+            _encode_record({"op": "append", "messages": [m]}) for m in messages
+        )
         # Atomic write: write temp then replace. We lock via lock file.
         tmp_fd, tmp_name = tempfile.mkstemp(
             prefix=paths.data.name + ".",
@@ -244,22 +570,75 @@ class QueueStore:
         )
         tmp_path = Path(tmp_name)
         try:
-            with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
-                f.write("\n")
-                f.flush()
-                os.fsync(f.fileno())
-            # Tighten permissions before replace (best-effort).
-            with contextlib.suppress(OSError):
-                tmp_path.chmod(0o600)
+            try:
+                # One unbuffered write of the whole journal, then sync. The
+                # sync runs even when not durable: renaming unsynced data over
+                # the journal can leave it empty after a power loss.
+                _write_all(tmp_fd, payload)
+                _fdatasync(tmp_fd)
+            finally:
+                os.close(tmp_fd)
+            # mkstemp already created the file 0o600, so no chmod is needed.
             tmp_path.replace(paths.data)
+        except BaseException:
+            # Don't leave the temp file behind; the original error wins.
+            with contextlib.suppress(OSError):
+                tmp_path.unlink()
+            raise
+        self._sync_base_dir()
+        paths.legacy.unlink(missing_ok=True)
+
+    def _sync_base_dir(self) -> None:
+        """Persist a new or renamed journal's directory entry when durable.
+
+        Syncing file data does not make a file's name durable; the directory
+        must be synced too. That is only needed when a journal is created or
+        swapped in by compaction, so the cost is not paid on every write.
+        """
+        if not self.durable:
+            return
+        # Some filesystems (e.g. SMB mounts) reject fsync on directories.
+        with contextlib.suppress(OSError):
+            _sync_dir(self.base_dir)
+
+    def _append_records_unlocked(
+        self, topic: str, records: list[dict[str, typ.Any]]
+    ) -> None:
+        """Append journal records with a single write, without locking."""
+        paths = self.paths_for_topic(topic)
+        payload = b"".join(_encode_record(r) for r in records)
+        fd = os.open(
+            paths.data,
+            os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC,
+            0o600,
+        )
+        try:
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                size = _trim_torn_tail(fd, size)
+            if not size:
+                payload = _encode_record(_journal_header(topic)) + payload
+            _write_all(fd, payload)
+            if self.durable:
+                _fdatasync(fd)
         finally:
-            # If replace failed, try to clean up.
-            try:
-                if tmp_path.exists():
-                    tmp_path.unlink()
-            except OSError:
-                pass
+            os.close(fd)
+        if not size:
+            self._sync_base_dir()  # The journal file may be new.
+
+    def _commit_unlocked(
+        self, topic: str, journal: _Journal, record: dict[str, typ.Any]
+    ) -> None:
+        """Record a change already applied to ``journal``, without locking.
+
+        The change is appended as one record, or folded into a compacted
+        rewrite when the journal has accumulated mostly dead records.
+        """
+        journal.records += 1
+        if journal.needs_compaction():
+            self._save_messages_unlocked(topic, list(journal.messages.values()))
+        else:
+            self._append_records_unlocked(topic, [record])
 
     # High-level operations (each takes responsibility for locking).
 
@@ -279,18 +658,49 @@ class QueueStore:
             UUID of the created message.
 
         """
-        msg = {
-            "uuid": str(uuid.uuid4()),
-            "created": _utc_now_iso(),
-            "content": content,
-        }
+        return self.append_many(topic, [content])[0]
+
+    def append_many(self, topic: str, contents: cabc.Iterable[str]) -> list[str]:
+        """Append several messages to the topic queue in one write.
+
+        The batch is written as a single journal record under one lock and one
+        fsync, without reading the existing queue. It is all-or-nothing: a
+        record cut short by a crash is discarded as a whole on replay.
+
+        Parameters
+        ----------
+        topic : str
+            Topic to append to.
+        contents : Iterable[str]
+            Message contents, in queue order.
+
+        Returns
+        -------
+        list[str]
+            UUIDs of the created messages, in the same order.
+
+        """
+        created = _utc_now_iso()
+        new_msgs: list[Message] = [
+            {"uuid": str(uuid.uuid4()), "created": created, "content": content}
+            for content in contents
+        ]
+        if not new_msgs:
+            return []
         with self.lock_topic(topic, exclusive=True):
-            msgs = self._load_messages_unlocked(topic)
-            msgs.append(msg)
-            self._save_messages_unlocked(topic, msgs)
-        return msg["uuid"]
+            paths = self.paths_for_topic(topic)
+            if not paths.data.exists() and paths.legacy.exists():
+                # First write since the upgrade: migrate the queue as well.
+                journal = self._replay_unlocked(topic)
+                msgs = [*journal.messages.values(), *new_msgs]
+                self._save_messages_unlocked(topic, msgs)
+            else:
+                self._append_records_unlocked(
+                    topic, [{"op": "append", "messages": new_msgs}]
+                )
+        return [m["uuid"] for m in new_msgs]
 
-    def pop_first(self, topic: str) -> dict[str, typ.Any] | None:
+    def pop_first(self, topic: str) -> Message | None:
         """Remove and return the first message from the topic queue.
 
         Parameters
@@ -300,19 +710,20 @@ class QueueStore:
 
         Returns
         -------
-        dict[str, typing.Any] | None
+        Message | None
             The first message, or None if queue is empty.
 
         """
         with self.lock_topic(topic, exclusive=True):
-            msgs = self._load_messages_unlocked(topic)
-            if not msgs:
+            journal = self._replay_unlocked(topic)
+            if not journal.messages:
                 return None
-            msg = msgs.pop(0)
-            self._save_messages_unlocked(topic, msgs)
+            uid = next(iter(journal.messages))
+            msg = journal.messages.pop(uid)
+            self._commit_unlocked(topic, journal, {"op": "del", "uuid": uid})
             return msg
 
-    def peek_first(self, topic: str) -> dict[str, typ.Any] | None:
+    def peek_first(self, topic: str) -> Message | None:
         """Get the first message without removing it.
 
         Parameters
@@ -322,15 +733,15 @@ class QueueStore:
 
         Returns
         -------
-        dict[str, typing.Any] | None
+        Message | None
             The first message, or None if queue is empty.
 
         """
         with self.lock_topic(topic, exclusive=False):
-            msgs = self._load_messages_unlocked(topic)
-            return msgs[0] if msgs else None
+            messages = self._replay_unlocked(topic).messages
+            return next(iter(messages.values()), None)
 
-    def get_by_uuid(self, topic: str, uid: str) -> dict[str, typ.Any] | None:
+    def get_by_uuid(self, topic: str, uid: str) -> Message | None:
         """Get a specific message by UUID.
 
         Parameters
@@ -342,18 +753,14 @@ class QueueStore:
 
         Returns
         -------
-        dict[str, typing.Any] | None
+        Message | None
             The message, or None if not found.
 
         """
         with self.lock_topic(topic, exclusive=False):
-            msgs = self._load_messages_unlocked(topic)
-            for m in msgs:
-                if m.get("uuid") == uid:
-                    return m
-            return None
+            return self._replay_matching_unlocked(topic, uid).messages.get(uid)
 
-    def list_messages(self, topic: str) -> list[dict[str, typ.Any]]:
+    def list_messages(self, topic: str) -> list[Message]:
         """List all messages in a topic.
 
         Parameters
@@ -363,12 +770,33 @@ class QueueStore:
 
         Returns
         -------
-        list[dict[str, typing.Any]]
+        list[Message]
+            Messages in FIFO order.
+
+        """
+        return list(self.iter_messages(topic))
+
+    def iter_messages(self, topic: str) -> cabc.Iterator[Message]:
+        """Yield the messages in a topic one at a time.
+
+        The topic is read under a shared lock, which is released before the
+        first message is yielded, so a slow consumer (for example a ``q list``
+        piped into a pager) never holds writers up.
+
+        Parameters
+        ----------
+        topic : str
+            Topic to list.
+
+        Yields
+        ------
+        Message
             Messages in FIFO order.
 
         """
         with self.lock_topic(topic, exclusive=False):
-            return list(self._load_messages_unlocked(topic))
+            msgs = self._load_messages_unlocked(topic)
+        yield from msgs
 
     def delete_by_uuid(self, topic: str, uid: str) -> bool:
         """Delete a specific message by UUID.
@@ -387,11 +815,10 @@ class QueueStore:
 
         """
         with self.lock_topic(topic, exclusive=True):
-            msgs = self._load_messages_unlocked(topic)
-            new_msgs = [m for m in msgs if m.get("uuid") != uid]
-            if len(new_msgs) == len(msgs):
+            journal = self._replay_unlocked(topic)
+            if journal.messages.pop(uid, None) is None:
                 return False
-            self._save_messages_unlocked(topic, new_msgs)
+            self._commit_unlocked(topic, journal, {"op": "del", "uuid": uid})
             return True
 
     def replace_by_uuid(self, topic: str, uid: str, content: str) -> bool:
@@ -409,18 +836,32 @@ class QueueStore:
         Returns
         -------
         bool
-            True if the message was replaced, False if not found.
+            True if the message now has ``content``, False if not found.
+
+        Notes
+        -----
+        Replacing a message with the content it already has writes nothing
+        and leaves its ``updated`` timestamp alone, so an editor session
+        closed without changes or a retried replace costs no disk write.
 
         """
         with self.lock_topic(topic, exclusive=True):
-            msgs = self._load_messages_unlocked(topic)
-            for m in msgs:
-                if m.get("uuid") == uid:
-                    m["content"] = content
-                    m["updated"] = _utc_now_iso()
-                    self._save_messages_unlocked(topic, msgs)
-                    return True
-            return False
+            journal = self._replay_unlocked(topic)
+            m = journal.messages.get(uid)
+            if m is None:
+                return False
+            if m["content"] == content:
+                return True
+            m["content"] = content
+            m["updated"] = _utc_now_iso()
+            record = {
+                "op": "replace",
+                "uuid": uid,
+                "content": content,
+                "updated": m["updated"],
+            }
+            self._commit_unlocked(topic, journal, record)
+            return True
 
 
 def default_base_dir() -> Path:
@@ -2,8 +2,18 @@
 
 These helpers wrap git queries and assemble queue topics based on the current
 repository state. Callers typically use ``derive_topic`` to build a queue topic
-string from ``get_first_remote`` and ``get_current_branch`` when inside a
-worktree.
+string when inside a worktree. ``derive_topic`` finds the repository by
+walking up from the working directory to the nearest ``.git`` (as git itself
+does), then reads the branch and remote names straight from ``HEAD`` and
+``config``, so the usual case spawns no subprocess at all. A single
+``git rev-parse`` is used only where git's own discovery rules matter, such as
+``GIT_DIR`` overrides or repositories owned by another user.
+``get_first_remote`` and ``get_current_branch`` remain available as standalone
+queries.
+
+Results are memoised per working directory: the git directory is located once,
+and the parsed remote/branch are reused until ``HEAD`` or ``config`` changes
+on disk, so repeated derivations in one process spawn no subprocesses.
 
 Examples
 --------
@@ -19,7 +29,29 @@ Derive a topic for the current working directory::
 
 from __future__ import annotations
 
-from claude_q.command_runner import GIT, run_sync
+import dataclasses as dc
+import functools
+import os
+import re
+import stat
+from pathlib import Path
+
+_HEAD_BRANCH_PREFIX = "ref: refs/heads/"
+# Linked worktrees and submodules have a ``.git`` file pointing elsewhere.
+_GITDIR_FILE_PREFIX = "gitdir:"
+# Variables that change how git locates a repository; leave those to git.
+_GIT_DISCOVERY_ENV = (
+    "GIT_DIR",
+    "GIT_WORK_TREE",
+    "GIT_COMMON_DIR",
+    "GIT_CEILING_DIRECTORIES",
+    "GIT_DISCOVERY_ACROSS_FILESYSTEM",
+)
+# Reftable repositories keep a placeholder HEAD pointing at this name.
+_REFTABLE_PLACEHOLDER = ".invalid"
+_REMOTE_SECTION_RE = re.compile(
+    r'^\s*\[\s*(?i:remote)\s+"((?:[^"\\\n]|\\.)+)"\s*\]', re.MULTILINE
+)
 
 
 class GitError(Exception):
@@ -44,8 +76,8 @@ def get_first_remote() -> str:
     output = _run_git_output(["remote"])
     if output is None:
         return ""
-    remotes = [line.strip() for line in output.splitlines() if line.strip()]
-    return remotes[0] if remotes else ""
+    # Leading blank lines are stripped, so the first line is the first remote.
+    return output.lstrip().partition("\n")[0].strip()
 
 
 def get_current_branch() -> str:
@@ -82,6 +114,29 @@ def is_in_git_worktree() -> bool:
     return output.strip() == "true"
 
 
+@dc.dataclass(frozen=True)
+class GitContext:
+    """Repository facts needed to derive a queue topic.
+
+    Attributes
+    ----------
+    in_worktree : bool
+        Whether the working directory is inside a git worktree.
+    remote : str
+        First remote name, or an empty string if none are configured.
+    branch : str
+        Current branch name, or an empty string if detached.
+
+    """
+
+    in_worktree: bool
+    remote: str = ""
+    branch: str = ""
+
+
+_NO_WORKTREE = GitContext(in_worktree=False)
+
+
 def combine_topic(remote: str, branch: str) -> str:
     """Combine remote and branch into a topic string.
 
@@ -109,8 +164,12 @@ def combine_topic(remote: str, branch: str) -> str:
 
 def _run_git_output(args: list[str]) -> str | None:
     """Run a git command and return stdout on success."""
+    # Deferred: cuprum imports asyncio, which dominates CLI start-up for
+    # commands that never reach git.
+    from claude_q import command_runner
+
     try:
-        result = run_sync(GIT, args)
+        result = command_runner.run_sync(command_runner.GIT, args)
     except Exception:  # noqa: BLE001  # TODO(leynos): https://github.com/leynos/claude-q/issues/123 - Cuprum raises varied exceptions.
         return None
     if not result.ok:
@@ -118,6 +177,158 @@ def _run_git_output(args: list[str]) -> str | None:
     return result.stdout or ""
 
 
+def _read_text(path: Path) -> str:
+    """Return file contents, or an empty string if the file is unreadable."""
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return ""
+
+
+def _mtime_ns(path: Path) -> int:
+    """Return the modification time of ``path``, or 0 if it is missing."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _common_git_dir(git_dir: Path) -> Path:
+    """Return the shared git directory for a (possibly linked) worktree."""
+    # Linked worktrees keep HEAD locally but share config via ``commondir``.
+    common = _read_text(git_dir / "commondir").strip()
+    return git_dir / common if common else git_dir
+
+
+def _branch_from_head(git_dir: Path) -> str:
+    """Read the checked-out branch from ``HEAD``; empty when detached."""
+    head = _read_text(git_dir / "HEAD").strip()
+    if not head.startswith(_HEAD_BRANCH_PREFIX):
+        return ""
+    branch = head.removeprefix(_HEAD_BRANCH_PREFIX)
+    if branch == _REFTABLE_PLACEHOLDER:
+        # HEAD is not authoritative under reftable; ask git instead.
+        return get_current_branch()
+    return branch
+
+
+def _first_remote_from_config(git_dir: Path) -> str:
+    """Return the first remote name declared in the repository config.
+
+    Names are sorted to match the ordering ``git remote`` prints.
+    """
+    config = _read_text(_common_git_dir(git_dir) / "config")
+    remotes = sorted(set(_REMOTE_SECTION_RE.findall(config)))
+    return remotes[0] if remotes else ""
+
+
+def _resolve_dot_git(dot_git: Path, st: os.stat_result) -> Path | None:
+    """Return the git directory a ``.git`` entry names, if it is a valid one."""
+    if stat.S_ISDIR(st.st_mode):
+        git_dir = dot_git
+    else:
+        pointer = _read_text(dot_git)
+        if not pointer.startswith(_GITDIR_FILE_PREFIX):
+            return None
+        target = pointer.removeprefix(_GITDIR_FILE_PREFIX).strip()
+        git_dir = (dot_git.parent / target).resolve()
+    return git_dir if (git_dir / "HEAD").is_file() else None
+
+
+def _discover_git_dir(cwd: str) -> Path | None:
+    """Walk up from ``cwd`` to the git directory of its worktree.
+
+    Returns None when git's own rules are needed to answer: discovery
+    environment overrides, an entry owned by another user (``safe.directory``),
+    a malformed ``.git``, or a working directory inside the git directory.
+    Raises ``GitError`` when no ``.git`` exists up to the filesystem root.
+    """
+    if any(name in os.environ for name in _GIT_DISCOVERY_ENV):
+        return None
+    directory = Path(cwd)
+    for candidate in (directory, *directory.parents):
+        dot_git = candidate / ".git"
+        try:
+            st = dot_git.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        except OSError:
+            return None
+        if st.st_uid != os.geteuid():
+            return None
+        git_dir = _resolve_dot_git(dot_git, st)
+        if git_dir is None or directory.is_relative_to(git_dir):
+            return None
+        return git_dir
+    msg = f"not in a git worktree: {cwd}"
+    raise GitError(msg)
+
+
+def _rev_parse_git_dir(cwd: str) -> Path:
+    """Ask git for the git directory of the process working directory."""
+    output = _run_git_output([
+        "rev-parse",
+        "--is-inside-work-tree",
+        "--absolute-git-dir",
+    ])
+    in_worktree, _, git_dir = (output or "").partition("\n")
+    if in_worktree.strip() != "true":
+        msg = f"not in a git worktree: {cwd}"
+        raise GitError(msg)
+    return Path(git_dir.strip())
+
+
+@functools.lru_cache(maxsize=32)
+def _find_git_dir(cwd: str) -> Path:
+    """Locate the git directory for ``cwd``, usually without running git.
+
+    ``cwd`` must be the process working directory; it also keys the cache.
+    Failures raise instead of returning, so they are never memoised and a
+    later ``git init`` is picked up.
+    """
+    git_dir = _discover_git_dir(cwd)
+    if git_dir is None:
+        return _rev_parse_git_dir(cwd)
+    return git_dir
+
+
+@functools.lru_cache(maxsize=32)
+def _read_git_context(
+    git_dir: Path,
+    head_mtime_ns: int,
+    config_mtime_ns: int,
+) -> GitContext:
+    """Parse remote and branch for ``git_dir``, memoised by file mtimes.
+
+    The mtimes are unused in the body; they only key the cache so a checkout
+    or remote change invalidates the entry.
+    """
+    return GitContext(
+        in_worktree=True,
+        remote=_first_remote_from_config(git_dir),
+        branch=_branch_from_head(git_dir),
+    )
+
+
+def _git_context() -> GitContext:
+    """Collect worktree, remote, and branch state for the current directory."""
+    # Only a string cache key is needed; skip building a Path object.
+    cwd = os.getcwd()  # noqa: PTH109
+    try:
+        git_dir = _find_git_dir(cwd)
+    except GitError:
+        return _NO_WORKTREE
+    try:
+        head_mtime_ns = (git_dir / "HEAD").stat().st_mtime_ns
+    except FileNotFoundError:
+        # The repository moved or vanished; forget it so the next call looks
+        # again rather than trusting a stale location.
+        _find_git_dir.cache_clear()
+        return _NO_WORKTREE
+    config_mtime_ns = _mtime_ns(_common_git_dir(git_dir) / "config")
+    return _read_git_context(git_dir, head_mtime_ns, config_mtime_ns)
+
+
 def derive_topic() -> str:
     """Derive a queue topic from the current git context.
 
@@ -132,14 +343,12 @@ def derive_topic() -> str:
         If not in a git worktree or cannot derive a topic.
 
     """
-    if not is_in_git_worktree():
+    context = _git_context()
+    if not context.in_worktree:
         msg = "not in a git worktree (cannot derive topic)"
         raise GitError(msg)
 
-    remote = get_first_remote()
-    branch = get_current_branch()
-
-    topic = combine_topic(remote, branch)
+    topic = combine_topic(context.remote, context.branch)
     if topic:
         return topic
 
@@ -13,20 +13,70 @@ Format a dequeue reason for a hook response::
 
 Hook entry points typically parse input and emit formatted output::
 
-    payload = json.load(sys.stdin)
+    payload = parse_hook_payload(sys.stdin.buffer.read())
     body = extract_qput_body(payload.get("prompt", ""))
-    out = format_dequeue_reason("origin/main", body or "")
+    write_hook_output({"decision": "block", "reason": body or ""})
 
-Hook wrappers in ``bins/`` consume stdin JSON and emit JSON responses.
+Payloads are decoded with ``orjson`` when it is installed (the ``speedups``
+extra) and with the standard library ``json`` module otherwise.
 
 """
 
 from __future__ import annotations
 
-import json
+import re
 import sys
+import typing as typ
+
+from claude_q._codec import dumps, loads
 
 PREFIX = "=qput"
+_LEADING_WS_RE = re.compile(r"\s*")
+_LEADING_NEWLINES_RE = re.compile(r"[\r\n]*")
+
+
+def parse_hook_payload(raw: bytes) -> dict[str, typ.Any]:
+    """Decode a JSON hook payload read from stdin.
+
+    Callers read raw bytes (``sys.stdin.buffer``) so the payload is decoded
+    in one pass, skipping the text-mode stdin wrapper.
+
+    Parameters
+    ----------
+    raw : bytes
+        Raw payload bytes.
+
+    Returns
+    -------
+    dict[str, Any]
+        Decoded payload object.
+
+    Raises
+    ------
+    ValueError
+        If stdin is not valid JSON.
+    TypeError
+        If the payload is not a JSON object.
+
+    """
+    payload = loads(raw)
+    if not isinstance(payload, dict):
+        msg = "hook payload must be a JSON object"
+        raise TypeError(msg)
+    return payload
+
+
+def write_hook_output(output: dict[str, typ.Any]) -> None:
+    """Write a JSON hook response to stdout and flush it.
+
+    Parameters
+    ----------
+    output : dict[str, Any]
+        Response object to serialise.
+
+    """
+    sys.stdout.buffer.write(dumps(output))
+    sys.stdout.flush()
 
 
 def block_with_message(message: str, *, use_exit2: bool = False) -> int:
@@ -54,8 +104,7 @@ def block_with_message(message: str, *, use_exit2: bool = False) -> int:
         "reason": message,
         "suppressOutput": True,
     }
-    sys.stdout.write(json.dumps(output))
-    sys.stdout.flush()
+    write_hook_output(output)
     return 0
 
 
@@ -75,26 +124,23 @@ def extract_qput_body(prompt: str, *, prefix: str = PREFIX) -> str | None:
         Extracted body string if the prompt matches the prefix, otherwise None.
 
     """
-    stripped = prompt.lstrip()
-    if not stripped.startswith(prefix):
+    # Locate the prefix in place rather than copying the prompt via lstrip().
+    leading = _LEADING_WS_RE.match(prompt)
+    start = leading.end() if leading else 0
+    if not prompt.startswith(prefix, start):
         return None
 
-    prefix_len = len(prefix)
-    if len(stripped) > prefix_len and stripped[prefix_len] not in {
-        " ",
-        "\t",
-        "\r",
-        "\n",
-    }:
-        return None
-
-    body = stripped[prefix_len:]
-    if body.startswith((" ", "\t")):
-        body = body[1:]
-    elif body.startswith(("\r\n", "\n", "\r")):
-        body = body.lstrip("\r\n")
-
-    return body
+    # Work out where the body starts, then copy it out with a single slice.
+    end = start + len(prefix)
+    if end == len(prompt):
+        return ""
+    sep = prompt[end]
+    if sep in {" ", "\t"}:
+        return prompt[end + 1 :]
+    if sep in {"\r", "\n"}:
+        newlines = _LEADING_NEWLINES_RE.match(prompt, end)
+        return prompt[newlines.end() if newlines else end :]
+    return None
 
 
 def format_dequeue_reason(topic: str, content: str) -> str:
@@ -19,7 +19,7 @@ from __future__ import annotations
 
 import typing as typ
 
-from claude_q.command_runner import GIT, RunOptions, run_sync
+from claude_q.command_runner import GIT, run_sync
 from claude_q.git_integration import GitError, combine_topic
 
 if typ.TYPE_CHECKING:
@@ -39,7 +39,7 @@ def run_command(
     cmd : list[str]
         Command arguments.
     cwd : str
-        Working directory to run in.
+        Directory git should operate in, passed as ``git -C <cwd>``.
     input_text : str | None, optional
         Optional stdin text.
 
@@ -63,7 +63,9 @@ def run_command(
     if cmd[0] != "git":
         msg = "only git commands are supported by this helper"
         raise ValueError(msg)
-    return run_sync(GIT, cmd[1:], options=RunOptions(cwd=cwd))
+    # ``-C`` rather than a child working directory: the spawn skips the
+    # chdir step and leaves CPython free to use posix_spawn.
+    return run_sync(GIT, ["-C", cwd, *cmd[1:]])
 
 
 def get_first_remote(cwd: str) -> str:
@@ -83,9 +85,8 @@ def get_first_remote(cwd: str) -> str:
     result = run_command(["git", "remote"], cwd)
     if not result.ok:
         return ""
-    stdout = result.stdout or ""
-    remotes = [line.strip() for line in stdout.splitlines() if line.strip()]
-    return remotes[0] if remotes else ""
+    # Leading blank lines are stripped, so the first line is the first remote.
+    return (result.stdout or "").lstrip().partition("\n")[0].strip()
 
 
 def get_current_branch(cwd: str) -> str:
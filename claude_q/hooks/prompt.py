@@ -21,13 +21,32 @@ Designed to be quiet - uses JSON output format for blocking.
 
 from __future__ import annotations
 
-import json
 import os
 import sys
 
-from claude_q.core import QueueStore, default_base_dir
-from claude_q.git_integration import GitError, derive_topic
-from claude_q.hooks._common import PREFIX, block_with_message, extract_qput_body
+from claude_q.hooks._common import (
+    PREFIX,
+    block_with_message,
+    extract_qput_body,
+    parse_hook_payload,
+)
+
+_PREFIX_BYTES = PREFIX.encode()
+
+
+def _qput_body(raw: bytes) -> str | None:
+    """Return the =qput body from a raw hook payload, or None to allow it."""
+    # Almost every prompt is not a =qput; skip decoding when the token cannot
+    # be present anywhere in the payload.
+    if _PREFIX_BYTES not in raw:
+        return None
+
+    try:
+        payload = parse_hook_payload(raw)
+    except Exception:  # noqa: BLE001  # TODO(leynos): https://github.com/leynos/claude-q/issues/123
+        return None  # Allow prompt on parse error
+
+    return extract_qput_body(str(payload.get("prompt") or ""), prefix=PREFIX)
 
 
 def main() -> int:
@@ -41,17 +60,15 @@ def main() -> int:
         0 if allowing prompt or successfully blocked, 2 if blocking with error.
 
     """
-    # Parse hook payload
-    try:
-        payload = json.load(sys.stdin)
-    except Exception:  # noqa: BLE001  # TODO(leynos): https://github.com/leynos/claude-q/issues/123
-        return 0  # Allow prompt on parse error
-
-    prompt = str(payload.get("prompt") or "")
-    body = extract_qput_body(prompt, prefix=PREFIX)
+    body = _qput_body(sys.stdin.buffer.read())
     if body is None:
         return 0  # Not a qput command - allow normally
 
+    # Deferred: only =qput prompts need git or the queue store, so ordinary
+    # prompts skip loading them.
+    from claude_q.core import QueueStore, default_base_dir
+    from claude_q.git_integration import GitError, derive_topic
+
     # Determine blocking mode (default to JSON for nicer UX)
     use_exit2 = os.environ.get("CLAUDE_QPUT_EXIT2", "") == "1"
 
@@ -11,12 +11,8 @@ Designed to be quiet and non-blocking - always exits 0.
 
 from __future__ import annotations
 
-import json
-import sys
-
-from claude_q.core import QueueStore, default_base_dir
 from claude_q.git_integration import GitError, derive_topic
-from claude_q.hooks._common import format_dequeue_reason
+from claude_q.hooks._common import format_dequeue_reason, write_hook_output
 
 
 def main() -> int:
@@ -39,6 +35,9 @@ def main() -> int:
         # Not in git context or cannot derive topic - allow stop
         return 0
 
+    # Deferred: outside a repository the hook never touches a queue.
+    from claude_q.core import QueueStore, default_base_dir
+
     # Try to dequeue (non-blocking)
     store = QueueStore(default_base_dir())
     try:
@@ -52,14 +51,13 @@ def main() -> int:
         return 0
 
     # Message found - block stop and feed it back to Claude
-    content = str(msg.get("content", ""))
+    content = msg["content"]
     reason = format_dequeue_reason(topic, content)
     output = {
         "decision": "block",
         "reason": reason,
     }
-    sys.stdout.write(json.dumps(output))
-    sys.stdout.flush()
+    write_hook_output(output)
     return 0
 
 
@@ -0,0 +1,211 @@
+"""Wait for a queue file to change instead of sleeping between polls.
+
+Blocking consumers (``q get --block``) watch the topic's data file and sleep
+in the kernel until it is appended to or replaced, rather than waking on a
+fixed interval to re-read the queue. The backend is chosen at runtime:
+
+- inotify (Linux), called through ``ctypes`` so no extra package is needed;
+- kqueue (macOS/BSD) from the standard library;
+- a plain ``time.sleep`` fallback everywhere else.
+
+The poll interval still bounds every wait, so a missed notification (for
+example on a network filesystem) costs at most one interval, exactly as
+before.
+
+Examples
+--------
+Wait up to a second for a topic file to change::
+
+    from claude_q.notify import watch_file
+
+    with watch_file(store.paths_for_topic("origin:main").data) as watcher:
+        watcher.wait(1.0)
+
+"""
+
+from __future__ import annotations
+
+import contextlib
+import math
+import os
+import select
+import struct
+import sys
+import time
+import typing as typ
+
+if typ.TYPE_CHECKING:
+    import collections.abc as cabc
+    from pathlib import Path
+
+# <sys/inotify.h>: event masks and the fixed header preceding each name.
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+_INOTIFY_READ_SIZE = 64 * 1024
+
+
+class FileWatcher(typ.Protocol):
+    """Blocks until a watched file may have changed."""
+
+    def wait(self, timeout: float) -> None:
+        """Block until the file changes or ``timeout`` seconds pass."""
+        ...
+
+    def close(self) -> None:
+        """Release any kernel resources held by the watcher."""
+        ...
+
+
+class _SleepWatcher:
+    """Fallback watcher that simply sleeps for the full timeout."""
+
+    def wait(self, timeout: float) -> None:  # noqa: PLR6301 - protocol method.
+        time.sleep(timeout)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class _InotifyWatcher:
+    """Linux watcher using inotify directly through libc."""
+
+    def __init__(self, path: Path) -> None:
+        # Deferred: only blocking waits on Linux need ctypes.
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_add_watch.argtypes = (
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        )
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        # Journal appends end in CLOSE_WRITE on the data file; compaction
+        # renames a new file into place, which shows up as MOVED_TO.
+        parent = os.fsencode(path.parent)
+        if libc.inotify_add_watch(fd, parent, _IN_MOVED_TO | _IN_CLOSE_WRITE) < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, os.strerror(err), path.parent)
+        self._fd = fd
+        self._name = os.fsencode(path.name)
+        self._poller = select.poll()
+        self._poller.register(fd, select.POLLIN)
+
+    def wait(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            if not self._poller.poll(max(1, math.ceil(remaining * 1000))):
+                return
+            # Lock-file and temp-file activity shares the directory; only
+            # a change to the topic's data file is worth waking for.
+            if self._name in self._read_names():
+                return
+
+    def _read_names(self) -> list[bytes]:
+        """Drain pending events and return the file names they concern."""
+        try:
+            data = os.read(self._fd, _INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return []
+        names: list[bytes] = []
+        offset = 0
+        while offset < len(data):
+            *_, name_len = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            names.append(data[offset : offset + name_len].rstrip(b"\0"))
+            offset += name_len
+        return names
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _KqueueWatcher:
+    """BSD/macOS watcher using kqueue vnode filters on the directory and file."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._dir_fd = os.open(path.parent, os.O_RDONLY)
+        self._file_fd: int | None = None
+        self._kqueue = select.kqueue()
+        # Directory writes reveal the file being created or renamed into
+        # place; appends only touch the file itself.
+        self._kqueue.control([self._vnode_event(self._dir_fd)], 0, 0)
+        self._watch_file()
+
+    @staticmethod
+    def _vnode_event(fd: int) -> select.kevent:
+        return select.kevent(
+            fd,
+            filter=select.KQ_FILTER_VNODE,
+            flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+            fflags=select.KQ_NOTE_WRITE
+            | select.KQ_NOTE_EXTEND
+            | select.KQ_NOTE_DELETE
+            | select.KQ_NOTE_RENAME,
+        )
+
+    def _watch_file(self) -> None:
+        """(Re)attach to the current data file, which compaction replaces."""
+        if self._file_fd is not None:
+            os.close(self._file_fd)
+            self._file_fd = None
+        try:
+            fd = os.open(self._path, os.O_RDONLY)
+        except FileNotFoundError:
+            return
+        self._file_fd = fd
+        self._kqueue.control([self._vnode_event(fd)], 0, 0)
+
+    def wait(self, timeout: float) -> None:
+        # Spurious wake-ups are harmless: the caller re-checks the queue.
+        if self._kqueue.control(None, 1, timeout):
+            self._watch_file()
+
+    def close(self) -> None:
+        self._kqueue.close()
+        if self._file_fd is not None:
+            os.close(self._file_fd)
+        os.close(self._dir_fd)
+
+
+def _open_watcher(path: Path) -> FileWatcher:
+    """Return the best available watcher for ``path``."""
+    if sys.platform == "linux":
+        with contextlib.suppress(OSError, AttributeError):
+            return _InotifyWatcher(path)
+    if hasattr(select, "kqueue"):
+        with contextlib.suppress(OSError):
+            return _KqueueWatcher(path)
+    return _SleepWatcher()
+
+
+@contextlib.contextmanager
+def watch_file(path: Path) -> cabc.Iterator[FileWatcher]:
+    """Watch ``path`` for appends, replacement or rewrite.
+
+    The parent directory must already exist. Register the watch *before*
+    checking the queue so a write landing between the check and the wait is
+    not missed.
+
+    Parameters
+    ----------
+    path : Path
+        File to watch (typically a topic's data file).
+
+    Yields
+    ------
+    FileWatcher
+        Watcher whose ``wait`` blocks until the file may have changed.
+
+    """
+    watcher = _open_watcher(path)
+    try:
+        yield watcher
+    finally:
+        watcher.close()
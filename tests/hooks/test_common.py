@@ -0,0 +1,64 @@
+"""Tests for claude_q.hooks._common payload helpers."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from claude_q.hooks import _common
+
+
+def test_parse_hook_payload_decodes_utf8_object() -> None:
+    """Ensure payloads are decoded from raw UTF-8 bytes."""
+    payload = _common.parse_hook_payload(
+        json.dumps({"prompt": "=qput café"}, ensure_ascii=False).encode()
+    )
+
+    assert payload == {"prompt": "=qput café"}, "payload should round-trip"
+
+
+def test_parse_hook_payload_rejects_invalid_json() -> None:
+    """Ensure malformed payloads raise ValueError."""
+    with pytest.raises(ValueError, match=r"."):
+        _common.parse_hook_payload(b"{not json")
+
+
+def test_parse_hook_payload_rejects_non_object() -> None:
+    """Ensure a JSON array is rejected rather than returned."""
+    with pytest.raises(TypeError, match="JSON object"):
+        _common.parse_hook_payload(b'["=qput"]')
+
+
+def test_block_with_message_writes_json(capsys: pytest.CaptureFixture[str]) -> None:
+    """Ensure the JSON block response is written to stdout."""
+    code = _common.block_with_message("Queued to 'origin:main'.")
+
+    assert code == 0, "JSON mode should exit 0"
+    assert json.loads(capsys.readouterr().out) == {
+        "decision": "block",
+        "reason": "Queued to 'origin:main'.",
+        "suppressOutput": True,
+    }, "stdout should hold the block response"
+
+
+@pytest.mark.parametrize(
+    ("prompt", "expected"),
+    [
+        ("=qput fix tests", "fix tests"),
+        ("  \n\t=qput\tindented", "indented"),
+        ("=qput\r\nline one\nline two", "line one\nline two"),
+        ("=qput\n\n  indented body", "  indented body"),
+        ("=qput  two spaces", " two spaces"),
+        ("=qput", ""),
+        ("=qputx", None),
+        ("please =qput later", None),
+        ("", None),
+        ("   ", None),
+    ],
+)
+def test_extract_qput_body(prompt: str, expected: str | None) -> None:
+    """Ensure only an exact leading =qput token yields a body."""
+    assert _common.extract_qput_body(prompt) == expected, (
+        f"unexpected body for {prompt!r}"
+    )
@@ -8,7 +8,6 @@ from unittest import mock
 
 import pytest
 
-from claude_q.command_runner import RunOptions
 from claude_q.hooks import _git_subprocess
 
 if typ.TYPE_CHECKING:
@@ -52,8 +51,4 @@ def test_run_command_executes_git_command() -> None:
         result = _git_subprocess.run_command(["git", "status"], "/repo")
 
     assert result is sentinel, "returns command result"
-    mock_run.assert_called_once_with(
-        _git_subprocess.GIT,
-        ["status"],
-        options=RunOptions(cwd="/repo"),
-    )
+    mock_run.assert_called_once_with(_git_subprocess.GIT, ["-C", "/repo", "status"])
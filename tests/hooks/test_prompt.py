@@ -0,0 +1,62 @@
+"""Tests for the =qput prompt hook."""
+
+from __future__ import annotations
+
+import io
+import json
+import subprocess  # noqa: S404 - runs the hook import in a fresh interpreter.
+import sys
+import typing as typ
+
+import pytest
+
+from claude_q.hooks import prompt
+
+if typ.TYPE_CHECKING:
+    from claude_q.core import QueueStore
+
+
+def _feed_payload(monkeypatch: pytest.MonkeyPatch, payload: dict[str, str]) -> None:
+    """Replace stdin with the JSON encoding of ``payload``."""
+    data = json.dumps(payload).encode()
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+
+def test_prompt_hook_skips_ordinary_prompts(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Prompts without the =qput token exit before any topic lookup."""
+    _feed_payload(monkeypatch, {"prompt": "Refactor the parser"})
+    monkeypatch.setattr("claude_q.git_integration.derive_topic", pytest.fail)
+
+    assert prompt.main() == 0, "ordinary prompts should be allowed"
+    assert not capsys.readouterr().out, "ordinary prompts should produce no output"
+
+
+def test_prompt_hook_import_skips_queue_store() -> None:
+    """Importing the hook does not load the queue storage module."""
+    code = "import sys, claude_q.hooks.prompt; sys.exit('claude_q.core' in sys.modules)"
+    result = subprocess.run(  # noqa: S603 - fixed interpreter and code.
+        [sys.executable, "-c", code], check=False
+    )
+    assert result.returncode == 0, "claude_q.core should load only for =qput"
+
+
+def test_prompt_hook_enqueues_qput_body(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    queue_store: QueueStore,
+) -> None:
+    """A =qput prompt is queued and blocked with a confirmation."""
+    _feed_payload(monkeypatch, {"prompt": "=qput Fix the tests"})
+    monkeypatch.setattr("claude_q.git_integration.derive_topic", lambda: "origin:main")
+    monkeypatch.setenv("Q_DIR", str(queue_store.base_dir))
+    monkeypatch.delenv("CLAUDE_QPUT_EXIT2", raising=False)
+
+    assert prompt.main() == 0, "JSON block mode should exit 0"
+    response = json.loads(capsys.readouterr().out)
+    assert response["decision"] == "block", "qput prompts should be blocked"
+    queued = queue_store.peek_first("origin:main")
+    assert queued is not None, "the body should be queued"
+    assert queued["content"] == "Fix the tests", "the prefix should be stripped"
@@ -0,0 +1,72 @@
+"""Tests for the ``q`` command implementations in claude_q.cli.app."""
+
+from __future__ import annotations
+
+import io
+import json
+import typing as typ
+
+import pytest
+
+from claude_q.cli.app import list_cmd, readto
+
+if typ.TYPE_CHECKING:
+    from claude_q.core import QueueStore
+
+
+@pytest.mark.parametrize("quiet", [False, True])
+def test_list_cmd_prints_every_message_in_order(
+    queue_store: QueueStore,
+    capsys: pytest.CaptureFixture[str],
+    *,
+    quiet: bool,
+) -> None:
+    """List output spans several write batches without dropping lines."""
+    uids = [queue_store.append("list-topic", f"task {i}\nmore") for i in range(70)]
+
+    code = list_cmd("list-topic", quiet=quiet, base_dir=queue_store.base_dir)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert code == 0, "list should exit 0"
+    assert [line.split(" ", 1)[0] for line in lines] == uids, (
+        "list should print each UUID once, in FIFO order"
+    )
+    if not quiet:
+        assert lines[-1].endswith(" task 69 …"), "summaries should follow UUIDs"
+
+
+def test_readto_batch_enqueues_each_record(
+    queue_store: QueueStore,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Batch mode splits stdin on the separator and prints one UUID each."""
+    data = b"first\0second\nline\0"
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+    code = readto("batch-topic", batch=True, base_dir=queue_store.base_dir)
+
+    uids = capsys.readouterr().out.splitlines()
+    msgs = queue_store.list_messages("batch-topic")
+    assert code == 0, "readto should exit 0"
+    assert [m["content"] for m in msgs] == ["first", "second\nline"], (
+        "each NUL-separated record should become one message"
+    )
+    assert uids == [m["uuid"] for m in msgs], "one UUID per queued message"
+
+
+def test_list_cmd_json_emits_one_object_per_message(
+    queue_store: QueueStore,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """JSON listing prints every stored field, one message per line."""
+    queue_store.append("json-topic", "café\nsecond line")
+    queue_store.append("json-topic", "plain")
+
+    code = list_cmd("json-topic", json=True, base_dir=queue_store.base_dir)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert code == 0, "list --json should exit 0"
+    assert [json.loads(line) for line in lines] == queue_store.list_messages(
+        "json-topic"
+    ), "each line should be the full stored message"
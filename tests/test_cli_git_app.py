@@ -0,0 +1,64 @@
+"""Tests for the ``git-q`` command implementations in claude_q.cli.git_app."""
+
+from __future__ import annotations
+
+import io
+import typing as typ
+
+import pytest
+
+from claude_q import git_integration
+from claude_q.cli.git_app import git_get, git_readto
+
+if typ.TYPE_CHECKING:
+    import collections.abc as cabc
+    from pathlib import Path
+
+    from claude_q.core import QueueStore
+
+
+@pytest.fixture(autouse=True)
+def clear_git_caches() -> cabc.Iterator[None]:
+    """Reset memoised git lookups so tests do not leak state."""
+    git_integration._find_git_dir.cache_clear()
+    yield
+    git_integration._find_git_dir.cache_clear()
+
+
+def test_git_readto_uses_derived_topic(
+    queue_store: QueueStore,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Stdin is queued under the remote:branch topic of the repository."""
+    git_dir = tmp_path / "repo" / ".git"
+    git_dir.mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+    (git_dir / "config").write_text('[remote "origin"]\n', encoding="utf-8")
+    monkeypatch.chdir(git_dir.parent)
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"hello")))
+
+    code = git_readto(base_dir=queue_store.base_dir)
+
+    msg = queue_store.peek_first("origin:main")
+    assert code == 0, "git-q readto should exit 0"
+    assert msg is not None, "message should be queued under origin:main"
+    assert capsys.readouterr().out == f"{msg['uuid']}\n", "should print the UUID"
+
+
+def test_git_get_outside_worktree_reports_error(
+    queue_store: QueueStore,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A missing repository is reported on stderr with exit code 1."""
+    monkeypatch.chdir(tmp_path)
+
+    code = git_get(base_dir=queue_store.base_dir)
+
+    assert code == 1, "git-q get should fail outside a worktree"
+    assert "not in a git worktree" in capsys.readouterr().err, (
+        "the git error should be reported"
+    )
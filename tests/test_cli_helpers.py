@@ -0,0 +1,174 @@
+"""Tests for claude_q.cli.helpers."""
+
+from __future__ import annotations
+
+import io
+import shlex
+import sys
+import threading
+import typing as typ
+
+import pytest
+
+from claude_q.cli.helpers import (
+    EditorError,
+    dequeue_with_poll,
+    edit_text,
+    editor_cmd,
+    read_stdin_text,
+    split_batch,
+    split_topic_and_body,
+    summarize,
+    write_content,
+)
+
+if typ.TYPE_CHECKING:
+    from claude_q.core import QueueStore
+
+
+def _python_editor(script: str) -> str:
+    """Return an $EDITOR value that runs a Python snippet on the file path."""
+    return shlex.join([sys.executable, "-c", script])
+
+
+@pytest.mark.parametrize(
+    ("visual", "editor", "expected"),
+    [
+        ("code --wait", "nano", ["code", "--wait"]),
+        ("", "emacs -nw", ["emacs", "-nw"]),
+        ("", "", ["vi"]),
+        ("", "'unterminated", ["vi"]),
+    ],
+)
+def test_editor_cmd_prefers_visual(
+    monkeypatch: pytest.MonkeyPatch, visual: str, editor: str, expected: list[str]
+) -> None:
+    """VISUAL wins over EDITOR, and unusable settings fall back to vi."""
+    monkeypatch.setenv("VISUAL", visual)
+    monkeypatch.setenv("EDITOR", editor)
+
+    cmd = editor_cmd()
+    cmd.append("mutated")
+
+    assert editor_cmd() == expected, "cached parses must not leak mutations"
+
+
+def test_edit_text_returns_edited_content(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Edit_text should return whatever the editor leaves in the file."""
+    script = (
+        "import pathlib, sys; p = pathlib.Path(sys.argv[1]); "
+        "p.write_text(p.read_text() + ' edited')"
+    )
+    monkeypatch.delenv("VISUAL", raising=False)
+    monkeypatch.setenv("EDITOR", _python_editor(script))
+
+    assert edit_text("draft") == "draft edited", "should read back edits"
+
+
+def test_edit_text_raises_on_editor_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Edit_text should raise EditorError when the editor exits non-zero."""
+    monkeypatch.delenv("VISUAL", raising=False)
+    monkeypatch.setenv("EDITOR", _python_editor("raise SystemExit(3)"))
+
+    with pytest.raises(EditorError, match="status 3") as excinfo:
+        edit_text("draft")
+    assert excinfo.value.exit_code == 3, "should record the editor exit code"
+
+
+def test_dequeue_with_poll_blocks_until_message(queue_store: QueueStore) -> None:
+    """Blocking dequeue should return a message appended while waiting."""
+    timer = threading.Timer(0.05, queue_store.append, args=("wait-topic", "hello"))
+    timer.start()
+    try:
+        msg = dequeue_with_poll(queue_store, "wait-topic", block=True, poll=0.05)
+    finally:
+        timer.join()
+
+    assert msg is not None, "should eventually dequeue the message"
+    assert msg["content"] == "hello", "should return the appended content"
+
+
+def test_dequeue_with_poll_non_blocking_empty(queue_store: QueueStore) -> None:
+    """Non-blocking dequeue should return None for an empty topic."""
+    msg = dequeue_with_poll(queue_store, "empty", block=False, poll=0.05)
+    assert msg is None, "should not wait when block is False"
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        ("", "(empty)"),
+        ("single line", "single line"),
+        ("trailing newline\n", "trailing newline"),
+        ("first  \t line\nsecond", "first line …"),
+        ("crlf line\r\nsecond", "crlf line …"),
+        ("trailing crlf\r\n", "trailing crlf"),
+        ("a\rb", "a …"),
+        ("a\u2028b", "a …"),
+        ("\nbody", "(empty) …"),
+    ],
+)
+def test_summarize_uses_first_line(content: str, expected: str) -> None:
+    """Summaries show the collapsed first line and flag further lines."""
+    assert summarize(content) == expected, f"unexpected summary for {content!r}"
+
+
+def test_read_stdin_text_preserves_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Stdin is decoded as UTF-8 with CRLF line endings left intact."""
+    data = "caf\u00e9\r\nline two\n".encode()
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+    assert read_stdin_text() == "caf\u00e9\r\nline two\n", "stdin should round-trip"
+
+
+def test_write_content_emits_utf8_bytes(
+    capsysbinary: pytest.CaptureFixture[bytes],
+) -> None:
+    """Content is written as UTF-8 after any pending text output."""
+    sys.stdout.write("header\n")
+    write_content("caf\u00e9\r\nline two")
+
+    assert capsysbinary.readouterr().out == "header\ncaf\u00e9\r\nline two".encode(), (
+        "content should follow earlier text output, byte for byte"
+    )
+
+
+@pytest.mark.parametrize(
+    ("text", "sep", "expected"),
+    [
+        ("a\0b\0", "\0", ["a", "b"]),
+        ("a\0b", "\0", ["a", "b"]),
+        ("a\0\0b", "\0", ["a", "", "b"]),
+        ("", "\0", []),
+        ("one\n---\ntwo", "\n---\n", ["one", "two"]),
+    ],
+)
+def test_split_batch(text: str, sep: str, expected: list[str]) -> None:
+    """Batches split on the separator, ignoring one trailing separator."""
+    assert split_batch(text, sep) == expected, f"unexpected split of {text!r}"
+
+
+def test_split_batch_rejects_empty_separator() -> None:
+    """An empty separator is a usage error."""
+    with pytest.raises(ValueError, match="separator is empty"):
+        split_batch("a", "")
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("origin:main\nbody\nmore", ("origin:main", "body\nmore")),
+        ("  topic  \n", ("topic", "")),
+        ("topic only", ("topic only", "")),
+    ],
+)
+def test_split_topic_and_body(text: str, expected: tuple[str, str]) -> None:
+    """The first line is the trimmed topic and the rest is kept verbatim."""
+    assert split_topic_and_body(text) == expected, "should split on first newline"
+
+
+@pytest.mark.parametrize("text", ["", "\nbody", "   \nbody"])
+def test_split_topic_and_body_rejects_empty_topic(text: str) -> None:
+    """A blank first line is rejected."""
+    with pytest.raises(ValueError, match="topic is empty"):
+        split_topic_and_body(text)
@@ -53,3 +53,17 @@ def test_run_sync_builds_command_and_runs_with_cwd(tmp_path: Path) -> None:
     assert cmd.run_sync.call_args_list == [
         mock.call(context=ctx, echo=False, capture=True)
     ], "runs command with default echo/capture settings"
+
+
+def test_run_sync_shares_default_context() -> None:
+    """Ensure calls without cwd/env/tags reuse one execution context."""
+    cmd = mock.Mock()
+    builder = mock.Mock(return_value=cmd)
+
+    with mock.patch("claude_q.command_runner._builder_for", return_value=builder):
+        run_sync(Program("git"), ["status"])
+        run_sync(Program("git"), ["status"], options=RunOptions(echo=True))
+
+    first, second = (call.kwargs["context"] for call in cmd.run_sync.call_args_list)
+    assert first is second, "default contexts should be shared"
+    assert first.cwd is None, "default context should not pin a cwd"
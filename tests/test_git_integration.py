@@ -15,18 +15,27 @@ Stub git command output::
 from __future__ import annotations
 
 import dataclasses as dc
+import os
+import typing as typ
 from unittest import mock
 
 import pytest
 
+from claude_q import git_integration
 from claude_q.git_integration import (
+    GitContext,
     GitError,
+    _git_context,
     derive_topic,
     get_current_branch,
     get_first_remote,
     is_in_git_worktree,
 )
 
+if typ.TYPE_CHECKING:
+    import collections.abc as cabc
+    from pathlib import Path
+
 
 @dc.dataclass(frozen=True)
 class FakeResult:
@@ -37,11 +46,23 @@ class FakeResult:
     exit_code: int = 0
 
 
-@mock.patch("claude_q.git_integration.run_sync")
+@pytest.fixture(autouse=True)
+def clear_git_caches() -> cabc.Iterator[None]:
+    """Reset memoised git lookups so tests do not leak state."""
+    git_integration._find_git_dir.cache_clear()
+    git_integration._read_git_context.cache_clear()
+    yield
+    git_integration._find_git_dir.cache_clear()
+    git_integration._read_git_context.cache_clear()
+
+
+@mock.patch("claude_q.command_runner.run_sync")
 @pytest.mark.parametrize(
     ("result", "expected"),
     [
         (FakeResult(stdout="origin\nupstream\n"), "origin"),
+        (FakeResult(stdout="\n  origin  \nupstream"), "origin"),
+        (FakeResult(stdout="solo"), "solo"),
         (FakeResult(stdout=""), ""),
         (FakeResult(stdout="origin\n", ok=False, exit_code=1), ""),
         (Exception("git error"), ""),
@@ -61,7 +82,7 @@ def test_get_first_remote_outputs(
     assert remote == expected, "should return expected remote output"
 
 
-@mock.patch("claude_q.git_integration.run_sync")
+@mock.patch("claude_q.command_runner.run_sync")
 @pytest.mark.parametrize(
     ("result", "expected"),
     [
@@ -86,7 +107,7 @@ def test_get_current_branch_outputs(
     assert branch == expected, "should return expected branch output"
 
 
-@mock.patch("claude_q.git_integration.run_sync")
+@mock.patch("claude_q.command_runner.run_sync")
 @pytest.mark.parametrize(
     ("result", "expected_state"),
     [
@@ -113,80 +134,203 @@ def test_is_in_git_worktree_outputs(
     )
 
 
-@mock.patch("claude_q.git_integration.is_in_git_worktree")
-@mock.patch("claude_q.git_integration.get_current_branch")
-@mock.patch("claude_q.git_integration.get_first_remote")
-def test_derive_topic_remote_and_branch(
-    mock_get_first_remote: mock.MagicMock,
-    mock_get_current_branch: mock.MagicMock,
-    mock_is_in_git_worktree: mock.MagicMock,
-) -> None:
-    """Test deriving topic when both remote and branch exist."""
-    mock_is_in_git_worktree.return_value = True
-    mock_get_first_remote.return_value = "origin"
-    mock_get_current_branch.return_value = "feature"
-
-    topic = derive_topic()
-    assert topic == "origin:feature", "should combine remote and branch"
-
-
-@mock.patch("claude_q.git_integration.is_in_git_worktree")
-@mock.patch("claude_q.git_integration.get_current_branch")
-@mock.patch("claude_q.git_integration.get_first_remote")
-def test_derive_topic_remote_only(
-    mock_get_first_remote: mock.MagicMock,
-    mock_get_current_branch: mock.MagicMock,
-    mock_is_in_git_worktree: mock.MagicMock,
-) -> None:
-    """Test deriving topic when only remote exists."""
-    mock_is_in_git_worktree.return_value = True
-    mock_get_first_remote.return_value = "origin"
-    mock_get_current_branch.return_value = ""
-
-    topic = derive_topic()
-    assert topic == "origin", "should return remote when branch missing"
-
-
-@mock.patch("claude_q.git_integration.is_in_git_worktree")
-@mock.patch("claude_q.git_integration.get_current_branch")
-@mock.patch("claude_q.git_integration.get_first_remote")
-def test_derive_topic_branch_only(
-    mock_get_first_remote: mock.MagicMock,
-    mock_get_current_branch: mock.MagicMock,
-    mock_is_in_git_worktree: mock.MagicMock,
+@mock.patch("claude_q.git_integration._git_context")
+@pytest.mark.parametrize(
+    ("remote", "branch", "expected"),
+    [
+        ("origin", "feature", "origin:feature"),
+        ("origin", "", "origin"),
+        ("", "feature", "feature"),
+    ],
+)
+def test_derive_topic_combines_context(
+    mock_git_context: mock.MagicMock, remote: str, branch: str, expected: str
 ) -> None:
-    """Test deriving topic when only branch exists."""
-    mock_is_in_git_worktree.return_value = True
-    mock_get_first_remote.return_value = ""
-    mock_get_current_branch.return_value = "feature"
+    """Test deriving topic from remote and branch combinations."""
+    mock_git_context.return_value = GitContext(
+        in_worktree=True, remote=remote, branch=branch
+    )
 
     topic = derive_topic()
-    assert topic == "feature", "should return branch when remote missing"
+    assert topic == expected, "should combine remote and branch"
 
 
-@mock.patch("claude_q.git_integration.is_in_git_worktree")
+@mock.patch("claude_q.git_integration._git_context")
 def test_derive_topic_not_in_worktree(
-    mock_is_in_git_worktree: mock.MagicMock,
+    mock_git_context: mock.MagicMock,
 ) -> None:
     """Test deriving topic when not in a git worktree."""
-    mock_is_in_git_worktree.return_value = False
+    mock_git_context.return_value = GitContext(in_worktree=False)
 
     with pytest.raises(GitError, match="not in a git worktree"):
         derive_topic()
 
 
-@mock.patch("claude_q.git_integration.is_in_git_worktree")
-@mock.patch("claude_q.git_integration.get_current_branch")
-@mock.patch("claude_q.git_integration.get_first_remote")
+@mock.patch("claude_q.git_integration._git_context")
 def test_derive_topic_no_remote_or_branch(
-    mock_get_first_remote: mock.MagicMock,
-    mock_get_current_branch: mock.MagicMock,
-    mock_is_in_git_worktree: mock.MagicMock,
+    mock_git_context: mock.MagicMock,
 ) -> None:
     """Test deriving topic when neither remote nor branch exist."""
-    mock_is_in_git_worktree.return_value = True
-    mock_get_first_remote.return_value = ""
-    mock_get_current_branch.return_value = ""
+    mock_git_context.return_value = GitContext(in_worktree=True)
 
     with pytest.raises(GitError, match="cannot derive topic"):
         derive_topic()
+
+
+def _make_git_dir(root: Path, *, head: str, config: str) -> Path:
+    """Create a minimal git directory with HEAD and config files."""
+    git_dir = root / ".git"
+    git_dir.mkdir()
+    (git_dir / "HEAD").write_text(head, encoding="utf-8")
+    (git_dir / "config").write_text(config, encoding="utf-8")
+    return git_dir
+
+
+@mock.patch("claude_q.command_runner.run_sync")
+def test_git_context_reads_head_and_config(
+    mock_run_sync: mock.MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test git context is read from HEAD/config without spawning git."""
+    _make_git_dir(
+        tmp_path,
+        head="ref: refs/heads/feature/x\n",
+        config=(
+            '[core]\n\tbare = false\n[remote "zed"]\n\turl = a\n'
+            '[remote "alpha"]\n\turl = b\n'
+        ),
+    )
+    subdir = tmp_path / "src" / "pkg"
+    subdir.mkdir(parents=True)
+    monkeypatch.chdir(subdir)
+
+    context = _git_context()
+
+    assert context == GitContext(
+        in_worktree=True, remote="alpha", branch="feature/x"
+    ), "should read sorted first remote and branch"
+    mock_run_sync.assert_not_called()
+
+
+@mock.patch("claude_q.command_runner.run_sync")
+def test_git_context_detached_head_in_linked_worktree(
+    mock_run_sync: mock.MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test detached HEAD and shared config lookup for linked worktrees."""
+    common = _make_git_dir(tmp_path, head="", config='[remote "origin"]\n')
+    worktree_dir = common / "worktrees" / "wt"
+    worktree_dir.mkdir(parents=True)
+    (worktree_dir / "HEAD").write_text("0123abcd\n", encoding="utf-8")
+    (worktree_dir / "commondir").write_text("../..\n", encoding="utf-8")
+    checkout = tmp_path / "wt"
+    checkout.mkdir()
+    (checkout / ".git").write_text("gitdir: ../.git/worktrees/wt\n", encoding="utf-8")
+    monkeypatch.chdir(checkout)
+
+    context = _git_context()
+
+    assert context == GitContext(in_worktree=True, remote="origin", branch=""), (
+        "should follow the gitdir file, use commondir config and treat a raw "
+        "sha as detached"
+    )
+    mock_run_sync.assert_not_called()
+
+
+@mock.patch("claude_q.command_runner.run_sync")
+def test_git_context_outside_worktree(
+    mock_run_sync: mock.MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test git context reports no worktree when no .git is found."""
+    monkeypatch.chdir(tmp_path)
+
+    assert _git_context() == GitContext(in_worktree=False), (
+        "should report not being in a worktree"
+    )
+    mock_run_sync.assert_not_called()
+
+
+@mock.patch("claude_q.command_runner.run_sync")
+@pytest.mark.parametrize(
+    ("result", "in_worktree"),
+    [
+        (FakeResult(stdout="true\n{git_dir}\n"), True),
+        (FakeResult(stdout="false\n{git_dir}\n"), False),
+        (FakeResult(stdout="", ok=False, exit_code=128), False),
+    ],
+)
+def test_git_context_asks_git_when_discovery_is_overridden(
+    mock_run_sync: mock.MagicMock,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    result: FakeResult,
+    *,
+    in_worktree: bool,
+) -> None:
+    """Test GIT_DIR and friends defer repository discovery to git."""
+    git_dir = _make_git_dir(
+        tmp_path, head="ref: refs/heads/main\n", config='[remote "origin"]\n'
+    )
+    monkeypatch.setenv("GIT_DIR", str(git_dir))
+    mock_run_sync.return_value = dc.replace(
+        result, stdout=result.stdout.format(git_dir=git_dir)
+    )
+
+    context = _git_context()
+
+    assert context.in_worktree is in_worktree, "should trust git's answer"
+    assert mock_run_sync.call_count == 1, "should spawn git exactly once"
+
+
+@mock.patch("claude_q.command_runner.run_sync")
+def test_git_context_asks_git_from_inside_git_dir(
+    mock_run_sync: mock.MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a working directory inside .git is left to git to judge."""
+    git_dir = _make_git_dir(tmp_path, head="", config="")
+    monkeypatch.chdir(git_dir)
+    mock_run_sync.return_value = FakeResult(stdout=f"false\n{git_dir}\n")
+
+    assert _git_context() == GitContext(in_worktree=False), (
+        "should not treat the git directory as a worktree"
+    )
+    assert mock_run_sync.call_count == 1, "should defer to git"
+
+
+@mock.patch("claude_q.command_runner.run_sync")
+def test_git_context_asks_git_for_foreign_owned_repo(
+    mock_run_sync: mock.MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test repositories owned by another user go through safe.directory."""
+    _make_git_dir(tmp_path, head="", config="")
+    monkeypatch.chdir(tmp_path)
+    foreign_uid = (tmp_path / ".git").stat().st_uid + 1
+    monkeypatch.setattr(os, "geteuid", lambda: foreign_uid)
+    mock_run_sync.return_value = FakeResult(stdout="", ok=False, exit_code=128)
+
+    assert _git_context() == GitContext(in_worktree=False), (
+        "should honour git refusing the repository"
+    )
+    assert mock_run_sync.call_count == 1, "should defer to git"
+
+
+@mock.patch("claude_q.command_runner.run_sync")
+def test_git_context_is_memoised_until_head_changes(
+    mock_run_sync: mock.MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test repeat lookups reuse the git dir and notice branch switches."""
+    git_dir = _make_git_dir(
+        tmp_path, head="ref: refs/heads/main\n", config='[remote "origin"]\n'
+    )
+    monkeypatch.setenv("GIT_DIR", str(git_dir))
+    mock_run_sync.return_value = FakeResult(stdout=f"true\n{git_dir}\n")
+
+    first = _git_context()
+    second = _git_context()
+    head = git_dir / "HEAD"
+    head.write_text("ref: refs/heads/feature\n", encoding="utf-8")
+    stat = head.stat()
+    os.utime(head, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    third = _git_context()
+
+    assert first.branch == second.branch == "main", "should reuse cached branch"
+    assert third.branch == "feature", "should re-read HEAD after it changes"
+    assert mock_run_sync.call_count == 1, "should locate the git dir only once"
@@ -0,0 +1,77 @@
+"""Tests for claude_q.notify."""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing as typ
+
+import pytest
+
+from claude_q import notify
+
+if typ.TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _has_kernel_watcher(path: Path) -> bool:
+    """Return True when a notification backend (not sleep) is available."""
+    watcher = notify._open_watcher(path)
+    watcher.close()
+    return not isinstance(watcher, notify._SleepWatcher)
+
+
+def _replace_later(target: Path, delay: float) -> threading.Thread:
+    """Atomically replace ``target`` from a background thread after a delay."""
+
+    def run() -> None:
+        time.sleep(delay)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text("new", encoding="utf-8")
+        tmp.replace(target)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_wait_wakes_when_file_replaced(tmp_path: Path) -> None:
+    """Wait should return promptly once the watched file is replaced."""
+    target = tmp_path / "topic.json"
+    if not _has_kernel_watcher(target):
+        pytest.skip("no inotify/kqueue backend available")
+
+    with notify.watch_file(target) as watcher:
+        thread = _replace_later(target, 0.05)
+        started = time.monotonic()
+        watcher.wait(5.0)
+        elapsed = time.monotonic() - started
+    thread.join()
+
+    assert elapsed < 2.0, "should wake on the replace, not the timeout"
+
+
+def test_inotify_ignores_sibling_files(tmp_path: Path) -> None:
+    """Writes to other files in the directory should not end the wait."""
+    target = tmp_path / "topic.json"
+    with notify.watch_file(target) as watcher:
+        if not isinstance(watcher, notify._InotifyWatcher):
+            pytest.skip("inotify backend not available")
+        (tmp_path / "topic.lock").write_text("", encoding="utf-8")
+        started = time.monotonic()
+        watcher.wait(0.2)
+        elapsed = time.monotonic() - started
+
+    assert elapsed >= 0.19, "a sibling write should not wake the watcher"
+
+
+def test_wait_times_out_without_changes(tmp_path: Path) -> None:
+    """Wait should honour the timeout when the file never changes."""
+    target = tmp_path / "topic.json"
+
+    with notify.watch_file(target) as watcher:
+        started = time.monotonic()
+        watcher.wait(0.1)
+        elapsed = time.monotonic() - started
+
+    assert elapsed >= 0.09, "should block for roughly the timeout"